@@ -0,0 +1,62 @@
+"""
+Benchmark screenshot encode time against payload size for each codec setting.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_encode                   # synthetic 1280x720 frame
+    python -m benchmarks.bench_encode screenshot.png --runs 20
+
+The first row is the old ``PNG optimize=True`` setting for reference.
+"""
+
+import argparse
+import base64
+import io
+import statistics
+import time
+
+from PIL import Image
+
+from benchmarks.frames import load_frame
+from server.encoding import encode_frame
+
+SETTINGS = [
+    ("png level 1", dict(codec="png", png_level=1)),
+    ("png level 6", dict(codec="png", png_level=6)),
+    ("jpeg q70", dict(codec="jpeg", quality=70)),
+    ("jpeg q85", dict(codec="jpeg", quality=85)),
+    ("jpeg q95", dict(codec="jpeg", quality=95)),
+    ("webp q75", dict(codec="webp", quality=75)),
+    ("webp q85", dict(codec="webp", quality=85)),
+]
+
+
+def _legacy_png(frame):
+    buffered = io.BytesIO()
+    Image.fromarray(frame).save(buffered, format="PNG", optimize=True, quality=85)
+    return buffered.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("image", nargs="?", help="Screenshot to encode (default: synthetic frame)")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    frame = load_frame(args.image)
+    cases = [("png optimize (old)", _legacy_png)]
+    cases += [(name, lambda f, kw=kwargs: encode_frame(f, **kw).data) for name, kwargs in SETTINGS]
+
+    print(f"{'setting':20} {'mean ms':>9} {'median ms':>10} {'bytes':>10} {'base64 KB':>10}")
+    for name, encode in cases:
+        timings = []
+        data = b""
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            data = encode(frame)
+            timings.append((time.perf_counter() - started) * 1000)
+        b64_kb = len(base64.b64encode(data)) / 1024
+        print(f"{name:20} {statistics.mean(timings):9.1f} {statistics.median(timings):10.1f} {len(data):10d} {b64_kb:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
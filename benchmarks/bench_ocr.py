@@ -0,0 +1,63 @@
+"""
+Benchmark the serial OCR pass against banded OCR over a process pool.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_ocr                      # synthetic 1280x720 frame
+    python -m benchmarks.bench_ocr screenshot.png --runs 10 --bands 2 4 8
+
+Reports mean/median milliseconds per frame and how many words each mode
+found compared with the serial pass.
+"""
+
+import argparse
+import statistics
+import time
+
+import cv2
+
+from benchmarks.frames import load_frame
+from server.ocr import BandedOcr, run_ocr
+
+
+def _time(fn, image, runs):
+    fn(image)  # warm up (pool spawn, model load)
+    timings = []
+    words = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        words = fn(image)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("image", nargs="?", help="Screenshot to OCR (default: synthetic frame)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--bands", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--overlap", type=int, default=32)
+    args = parser.parse_args()
+
+    frame = cv2.cvtColor(load_frame(args.image), cv2.COLOR_RGB2BGR)
+
+    timings, serial_words = _time(run_ocr, frame, args.runs)
+    baseline = {w["text"] for w in serial_words}
+    rows = [("serial", timings, len(serial_words), 1.0)]
+
+    for bands in args.bands:
+        banded = BandedOcr(bands=bands, workers=args.workers, overlap=args.overlap)
+        try:
+            timings, words = _time(banded, frame, args.runs)
+        finally:
+            banded.close()
+        agreement = len(baseline & {w["text"] for w in words}) / len(baseline) if baseline else 1.0
+        rows.append((f"banded x{bands} ({banded.workers} workers)", timings, len(words), agreement))
+
+    print(f"{'mode':32} {'mean ms':>9} {'median ms':>10} {'words':>6} {'agree':>6}")
+    for name, timings, count, agreement in rows:
+        print(f"{name:32} {statistics.mean(timings):9.1f} {statistics.median(timings):10.1f} {count:6d} {agreement:6.0%}")
+
+
+if __name__ == "__main__":
+    main()
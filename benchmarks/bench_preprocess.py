@@ -0,0 +1,77 @@
+"""
+Benchmark frame preprocessing (resize + OCR input preparation) per preset.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_preprocess               # synthetic 2560x1440 frame
+    python -m benchmarks.bench_preprocess screenshot.png --runs 50 --ocr
+
+The first row is the old pipeline (PIL Lanczos resize, array copy, RGB->BGR)
+for reference. With ``--ocr`` each row also reports OCR recall: the share of
+the synthetic frame's drawn words that Tesseract read back.
+"""
+
+import argparse
+import statistics
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from benchmarks.frames import synthetic_frame
+from server.preprocess import PRESETS, Preprocessor
+
+SIZE = (1280, 720)
+
+
+def _legacy(frame):
+    resized = np.array(Image.fromarray(frame).resize(SIZE, Image.Resampling.LANCZOS))
+    return cv2.cvtColor(resized, cv2.COLOR_RGB2BGR)
+
+
+def _pipeline(preset):
+    preprocessor = Preprocessor(size=SIZE, preset=preset)
+    return lambda frame: preprocessor.for_ocr(preprocessor.gray(preprocessor.resize(frame)))
+
+
+def _recall(image, expected):
+    from server.ocr import run_ocr
+
+    try:
+        found = {w["text"] for w in run_ocr(image)}
+    except Exception as e:
+        print(f"OCR unavailable: {e}")
+        return None
+    return sum(word in found for word in expected) / max(len(expected), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("image", nargs="?", help="Screenshot to preprocess (default: synthetic frame)")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--ocr", action="store_true", help="Also report OCR recall on the synthetic words")
+    args = parser.parse_args()
+
+    if args.image:
+        frame, expected = np.asarray(Image.open(args.image).convert("RGB")), []
+    else:
+        frame, expected = synthetic_frame(2560, 1440)
+
+    cases = [("lanczos+bgr (old)", _legacy)] + [(f"area+{preset}", _pipeline(preset)) for preset in PRESETS]
+
+    print(f"frame {frame.shape[1]}x{frame.shape[0]} -> {SIZE[0]}x{SIZE[1]}")
+    print(f"{'pipeline':20} {'mean ms':>9} {'median ms':>10} {'recall':>8}")
+    for name, prepare in cases:
+        prepare(frame)  # warm up buffers
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            out = prepare(frame)
+            timings.append((time.perf_counter() - started) * 1000)
+        recall = _recall(out, expected) if args.ocr and expected else None
+        recall_text = f"{recall:8.0%}" if recall is not None else f"{'n/a':>8}"
+        print(f"{name:20} {statistics.mean(timings):9.2f} {statistics.median(timings):10.2f} {recall_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark characters per second for each ``type_text`` strategy.
+
+Text is entered into a Tk text box, and each strategy is timed until the box
+holds the full text. A strategy that loses characters is reported as such.
+This needs a display. Run it headless under Xvfb (from the repository root):
+    xvfb-run -a python -m benchmarks.bench_typing
+    xvfb-run -a python -m benchmarks.bench_typing --chars 2000 --unicode
+
+Pasting on Linux needs xclip or xsel for pyperclip.
+"""
+
+import argparse
+import queue
+import threading
+import time
+
+import pyautogui
+
+from server.text_entry import TextTyper
+
+PARAGRAPH = ("Hi team, following up on yesterday's call: the rollout is scheduled for Thursday and the "
+             "checklist is in the shared folder.\tPlease review it before standup.\n")
+UNICODE = "Merci pour le café -- naïve résumé, 東京, ✓ done.\n"
+
+
+def sample_text(chars: int, unicode: bool) -> str:
+    unit = PARAGRAPH + (UNICODE if unicode else "")
+    return (unit * (chars // len(unit) + 1))[:chars]
+
+
+class TextBox:
+    """Tk text box whose widget calls are marshalled onto the Tk main thread."""
+
+    def __init__(self):
+        import tkinter as tk
+
+        self.root = tk.Tk()
+        self.root.title("bench_typing")
+        self.root.geometry("900x600+0+0")
+        self.text = tk.Text(self.root)
+        self.text.pack(fill="both", expand=True)
+        self.calls: "queue.Queue" = queue.Queue()
+        self.root.after(10, self._poll)
+
+    def _poll(self):
+        while not self.calls.empty():
+            fn, reply = self.calls.get()
+            reply.put(fn())
+        self.root.after(10, self._poll)
+
+    def call(self, fn):
+        reply: "queue.Queue" = queue.Queue()
+        self.calls.put((fn, reply))
+        return reply.get()
+
+    def reset(self):
+        def clear():
+            self.text.delete("1.0", "end")
+            self.root.focus_force()
+            self.text.focus_set()
+        self.call(clear)
+
+    def content(self) -> str:
+        return self.call(lambda: self.text.get("1.0", "end-1c"))
+
+
+def measure(box: TextBox, typer: TextTyper, text: str, interval: float, timeout: float):
+    """Return (seconds until the box held ``text`` or stopped changing, final content)."""
+    box.reset()
+    started = time.perf_counter()
+    typer.type(text, interval=interval)
+    last, changed = None, time.perf_counter()
+    while True:
+        content = box.content()
+        now = time.perf_counter()
+        if content == text:
+            return now - started, content
+        if content != last:
+            last, changed = content, now
+        elif now - changed > 1.0 or now - started > timeout:
+            return changed - started, content
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=500, help="Length of the text to enter")
+    parser.add_argument("--interval", type=float, default=0.05, help="Keystroke interval of type_text")
+    parser.add_argument("--unicode", action="store_true", help="Mix non-ASCII text into the sample")
+    parser.add_argument("--threshold", type=int, default=64, help="Paste threshold for the auto strategy")
+    args = parser.parse_args()
+
+    text = sample_text(args.chars, args.unicode)
+    strategies = [
+        (f"keys @ {args.interval}s", TextTyper("keys"), args.interval),
+        ("keys @ 0s", TextTyper("keys"), 0.0),
+        ("paste", TextTyper("paste"), args.interval),
+        (f"auto (>= {args.threshold})", TextTyper("auto", args.threshold), args.interval),
+    ]
+    box = TextBox()
+
+    def run():
+        time.sleep(0.5)  # let the window map and take focus
+        print(f"{len(text)} characters ({text.count(chr(10))} newlines, {text.count(chr(9))} tabs)")
+        print(f"{'strategy':18} {'seconds':>9} {'chars/s':>10}  result")
+        for name, typer, interval in strategies:
+            elapsed, content = measure(box, typer, text, interval, timeout=len(text) * (interval + 0.02) + 10)
+            result = "ok" if content == text else f"lost {len(text) - len(content)} chars" if len(content) < len(text) else "mismatch"
+            print(f"{name:18} {elapsed:9.2f} {len(content) / elapsed if elapsed else 0:10.0f}  {result}")
+        box.call(box.root.quit)
+
+    pyautogui.FAILSAFE = False
+    threading.Thread(target=run, daemon=True).start()
+    box.root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Check the local complexity rules against labels recorded from the remote classifier.
+
+Record labels by running the backend with REMOTO_CLASSIFIER=record, then
+(from the repository root):
+    python -m benchmarks.eval_classifier                          # ~/.remoto/data/classifier.jsonl
+    python -m benchmarks.eval_classifier labels.jsonl --threshold 0.6 --show 20
+
+Commands are re-classified with the current rules, so edits to
+``server/classifier.py`` can be checked without recording again. Reports how
+many commands the rules would answer on their own at the threshold (the
+share of remote calls saved), how often they agree with the remote label,
+and a confusion matrix.
+"""
+
+import argparse
+import json
+from collections import Counter
+
+from server.classifier import DEFAULT_RECORD_PATH, classify_local
+
+LABELS = ("simple", "medium", "complex")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", default=str(DEFAULT_RECORD_PATH), help="Recorded JSONL labels")
+    parser.add_argument("--threshold", type=float, default=0.7, help="Rule confidence needed to skip the remote call")
+    parser.add_argument("--show", type=int, default=10, help="Disagreements to print")
+    args = parser.parse_args()
+
+    records = {}
+    with open(args.path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                if entry.get("remote") in LABELS:
+                    records[entry["normalized"]] = entry  # latest label wins
+
+    confusion = Counter()
+    confident = agree = confident_agree = 0
+    disagreements = []
+    for text, entry in records.items():
+        local = classify_local(text)
+        remote = entry["remote"]
+        confusion[(remote, local["complexity"])] += 1
+        matched = local["complexity"] == remote
+        agree += matched
+        if local["confidence"] >= args.threshold:
+            confident += 1
+            confident_agree += matched
+            if not matched:
+                disagreements.append((text, remote, local))
+
+    total = len(records)
+    if not total:
+        print(f"No labelled commands in {args.path}")
+        return
+
+    print(f"{total} distinct commands from {args.path}")
+    print(f"agreement (all):        {agree / total:6.1%}")
+    print(f"answered locally:       {confident / total:6.1%}  (confidence >= {args.threshold})")
+    if confident:
+        print(f"agreement (answered):   {confident_agree / confident:6.1%}")
+
+    print("\n" + f"{'remote / local':16}" + "".join(f"{label:>9}" for label in LABELS))
+    for remote in LABELS:
+        print(f"{remote:16}" + "".join(f"{confusion[(remote, local)]:9d}" for local in LABELS))
+
+    if disagreements and args.show:
+        print(f"\nConfident disagreements (first {args.show}):")
+        for text, remote, local in disagreements[:args.show]:
+            print(f"  [{remote} vs {local['complexity']} @ {local['confidence']}] {text}  -- {local['reasoning']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Test frames shared by the benchmark scripts.
+
+Benchmarks run against a real screenshot when one is given, otherwise against
+a synthetic desktop-like frame with known words so results are repeatable on
+machines without a display.
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+WORDS = [
+    "File", "Edit", "View", "Insert", "Format", "Tools", "Help", "Compose", "Inbox",
+    "Sent", "Drafts", "Settings", "Search", "Submit", "Cancel", "Save", "Open",
+    "Sign", "in", "Account", "Notifications", "Calendar", "Messages", "Reply",
+    "Forward", "Delete", "Archive", "Refresh", "Download", "Upload", "Share",
+]
+
+
+def synthetic_frame(width: int = 1280, height: int = 720, seed: int = 0) -> Tuple[np.ndarray, List[str]]:
+    """Render rows of UI-style words on a light background.
+
+    Returns:
+        (rgb_frame, words_drawn)
+    """
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), (246, 246, 246))
+    draw = ImageDraw.Draw(image)
+    drawn = []
+    y = 12
+    while y < height - 30:
+        size = rng.choice([13, 15, 18, 22])
+        font = ImageFont.load_default(size=size)
+        x = 16
+        while x < width - 160:
+            word = rng.choice(WORDS)
+            draw.text((x, y), word, fill=(20, 20, 20), font=font)
+            drawn.append(word)
+            x += int(draw.textlength(word, font=font)) + rng.randint(18, 60)
+        y += size + rng.randint(14, 30)
+    return np.asarray(image), drawn
+
+
+def load_frame(path: Optional[str] = None, size: Tuple[int, int] = (1280, 720)) -> np.ndarray:
+    """Load a screenshot as an RGB array resized to ``size``, or a synthetic frame."""
+    if not path:
+        return synthetic_frame(*size)[0]
+    return np.asarray(Image.open(path).convert("RGB").resize(size, Image.Resampling.LANCZOS))
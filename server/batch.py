@@ -0,0 +1,73 @@
+"""
+Planning of the tool calls in one LLM turn.
+
+A single Backboard response often asks for several tools at once ("open
+notepad, type this, save it"). Running each call on its own pays an input
+executor round trip and a progress event per keystroke call, and never lets
+consecutive keystrokes go out together. ``plan`` groups the calls instead:
+consecutive keyboard and pointer calls become one burst that runs back to
+back on the input thread, and everything else (app launches, element search,
+workflows, memory) stays a step of its own.
+
+Inside a burst the only pause is a short settle after a key that can move
+focus or open/close a window (Enter, Esc, Tab, shortcuts), so text typed next
+lands in the right place. Every call still returns its own result dict.
+"""
+
+from typing import Any, Dict, List, NamedTuple
+
+# Calls that are plain PyAutoGUI input and can run back to back on the input thread
+BURST_TOOLS = ("type_text", "press_key", "press_hotkey", "click_position", "scroll_page")
+
+# Single keys after which the focused window or dialog may change
+FOCUS_KEYS = {"enter", "return", "esc", "escape", "tab", "win", "winleft", "winright", "f5", "alt"}
+
+
+class ToolCall(NamedTuple):
+    name: str
+    args: Dict[str, Any]
+
+
+class Step(NamedTuple):
+    burst: bool
+    indices: List[int]
+
+
+def plan(calls: List[ToolCall]) -> List[Step]:
+    """Group a turn's calls into bursts of consecutive input calls and single steps.
+
+    Args:
+        calls: Tool calls in the order the model issued them.
+
+    Returns:
+        Steps covering every call index exactly once, in order. A burst step
+        always holds at least two calls.
+    """
+    steps: List[Step] = []
+    run: List[int] = []
+
+    def flush():
+        if len(run) > 1:
+            steps.append(Step(True, list(run)))
+        elif run:
+            steps.append(Step(False, list(run)))
+        run.clear()
+
+    for index, call in enumerate(calls):
+        if call.name in BURST_TOOLS:
+            run.append(index)
+        else:
+            flush()
+            steps.append(Step(False, [index]))
+    flush()
+    return steps
+
+
+def changes_focus(call: ToolCall) -> bool:
+    """True if the UI should settle after ``call`` before the next input is sent."""
+    if call.name == "press_hotkey":
+        return True
+    if call.name == "press_key":
+        key = call.args.get("key", "") if isinstance(call.args, dict) else ""
+        return str(key).lower() in FOCUS_KEYS
+    return call.name == "click_position"
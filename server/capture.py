@@ -0,0 +1,366 @@
+"""
+Background screen capture for the Remoto backend.
+
+A dedicated process grabs the desktop continuously and writes each frame into
+a preallocated ``multiprocessing.shared_memory`` ring buffer. Request handlers
+in ``server/main.py`` read the most recent frame straight out of shared memory
+instead of blocking on a cold ``pyautogui.screenshot()`` call, and the capture
+work runs outside the FastAPI worker's GIL.
+
+Setting REMOTO_MONITOR captures one specific monitor through ``mss`` (an
+optional dependency); ``monitor_rect`` and ``dpi_scale`` describe where the
+captured pixels sit on the desktop so clicks can be mapped back.
+"""
+
+import multiprocessing as mp
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Header layout (int64 words) at the start of the shared block:
+#   [0] latest published sequence number (-1 until the first frame)
+#   [1] frame height  [2] frame width  [3] slot count
+#   [4] capture process status (0 = starting, 1 = running, 2 = stopped, 3 = size changed)
+# followed by one int64 sequence number and one float64 timestamp per slot.
+_HEADER_WORDS = 8
+_SEQ, _HEIGHT, _WIDTH, _SLOTS, _STATUS = range(5)
+_STATUS_STARTING, _STATUS_RUNNING, _STATUS_STOPPED, _STATUS_RESIZED = range(4)
+_WRITING = -1
+
+
+def _layout(slots: int, height: int, width: int) -> Tuple[int, int, int]:
+    """Return (header_bytes, frame_bytes, total_bytes) for a ring of the given shape."""
+    header_bytes = (_HEADER_WORDS + 2 * slots) * 8
+    header_bytes = (header_bytes + 63) // 64 * 64  # keep frames cache-line aligned
+    frame_bytes = height * width * 3
+    return header_bytes, frame_bytes, header_bytes + frame_bytes * slots
+
+
+class FrameRing:
+    """View over a shared-memory ring of RGB frames.
+
+    Both the capture process (writer) and the server (reader) wrap the same
+    shared block with this class. Each slot carries its own sequence number
+    that the writer invalidates before copying a frame in, so a reader can
+    detect that a slot was overwritten while it was using it.
+
+    Args:
+        shm: The shared memory block holding the ring.
+        slots: Number of frame slots in the ring.
+        height: Frame height in pixels.
+        width: Frame width in pixels.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, height: int, width: int):
+        self.shm = shm
+        self.slots = slots
+        header_bytes, frame_bytes, _ = _layout(slots, height, width)
+        self.header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        self.slot_seq = np.ndarray((slots,), dtype=np.int64, buffer=shm.buf, offset=_HEADER_WORDS * 8)
+        self.slot_time = np.ndarray((slots,), dtype=np.float64, buffer=shm.buf, offset=(_HEADER_WORDS + slots) * 8)
+        self.frames = np.ndarray((slots, height, width, 3), dtype=np.uint8, buffer=shm.buf, offset=header_bytes)
+
+    @classmethod
+    def create(cls, slots: int, height: int, width: int) -> "FrameRing":
+        """Allocate a new shared block and initialise its header."""
+        _, _, total = _layout(slots, height, width)
+        shm = shared_memory.SharedMemory(create=True, size=total)
+        ring = cls(shm, slots, height, width)
+        ring.header[:] = 0
+        ring.header[_SEQ] = -1
+        ring.header[_HEIGHT] = height
+        ring.header[_WIDTH] = width
+        ring.header[_SLOTS] = slots
+        ring.slot_seq[:] = _WRITING
+        ring.slot_time[:] = 0.0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, slots: int, height: int, width: int) -> "FrameRing":
+        """Attach to an existing shared block by name."""
+        return cls(shared_memory.SharedMemory(name=name), slots, height, width)
+
+    @property
+    def status(self) -> int:
+        return int(self.header[_STATUS])
+
+    def write(self, frame: np.ndarray, captured_at: float):
+        """Copy a frame into the next slot and publish it (writer side)."""
+        seq = int(self.header[_SEQ]) + 1
+        index = seq % self.slots
+        self.slot_seq[index] = _WRITING
+        np.copyto(self.frames[index], frame)
+        self.slot_time[index] = captured_at
+        self.slot_seq[index] = seq
+        self.header[_SEQ] = seq
+
+    def latest(self) -> Optional[Tuple[np.ndarray, int, float]]:
+        """Return (frame_view, seq, captured_at) for the newest complete frame.
+
+        The returned array is a zero-copy view into shared memory. It stays
+        valid until the writer wraps around the ring; use ``is_intact`` after
+        consuming it to confirm it was not overwritten in the meantime.
+        """
+        seq = int(self.header[_SEQ])
+        if seq < 0:
+            return None
+        index = seq % self.slots
+        if int(self.slot_seq[index]) != seq:
+            return None
+        return self.frames[index], seq, float(self.slot_time[index])
+
+    def is_intact(self, seq: int) -> bool:
+        """Check that the slot holding ``seq`` has not been reused since it was read."""
+        return int(self.slot_seq[seq % self.slots]) == seq
+
+    def close(self):
+        """Release this process's mapping of the shared block."""
+        # Drop numpy views first, otherwise SharedMemory.close() refuses to unmap.
+        self.header = self.slot_seq = self.slot_time = self.frames = None
+        self.shm.close()
+
+
+_mss_local = threading.local()
+
+
+def selected_monitor() -> Optional[int]:
+    """Monitor chosen with REMOTO_MONITOR (1 = primary, 2 = second, ...; 0 = all), or None."""
+    value = os.getenv("REMOTO_MONITOR", "").strip()
+    return int(value) if value else None
+
+
+def _mss():
+    """Per-thread ``mss`` grabber, or None when mss is not installed."""
+    grabber = getattr(_mss_local, "grabber", None)
+    if grabber is None:
+        try:
+            import mss
+        except ImportError:
+            return None
+        grabber = _mss_local.grabber = mss.mss()
+    return grabber
+
+
+def monitor_rect(frame_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+    """Physical-pixel rectangle (left, top, width, height) that full frames are captured from.
+
+    With REMOTO_MONITOR set (and mss installed) this is that monitor's place
+    on the virtual desktop; otherwise frames come from the primary monitor
+    at the origin.
+    """
+    monitor = selected_monitor()
+    grabber = _mss() if monitor is not None else None
+    if grabber is not None:
+        rect = grabber.monitors[monitor]
+        return rect["left"], rect["top"], rect["width"], rect["height"]
+    return 0, 0, frame_shape[1], frame_shape[0]
+
+
+def dpi_scale(frame_shape: Tuple[int, ...]) -> Tuple[float, float]:
+    """Logical (PyAutoGUI) points per physical screenshot pixel, per axis.
+
+    On scaled high-DPI displays screenshots are taken in physical pixels while
+    PyAutoGUI moves the mouse in logical points, so a 2560x1600 capture may
+    correspond to a 1280x800 or 1707x1067 point desktop. The ratio is measured
+    against the primary monitor, which is what ``pyautogui.size()`` reports.
+    """
+    import pyautogui
+
+    logical_width, logical_height = pyautogui.size()
+    grabber = _mss() if selected_monitor() is not None else None
+    if grabber is not None:
+        primary = grabber.monitors[1]
+        physical_width, physical_height = primary["width"], primary["height"]
+    else:
+        physical_height, physical_width = frame_shape[:2]
+    return logical_width / physical_width, logical_height / physical_height
+
+
+def grab_screen(region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+    """Take a direct screenshot and return it as an RGB (height, width, 3) array.
+
+    Args:
+        region: Optional physical-pixel (left, top, width, height) to capture
+            at native resolution instead of the whole monitor.
+    """
+    monitor = selected_monitor()
+    grabber = _mss() if monitor is not None else None
+    if grabber is not None:
+        if region is not None:
+            left, top, width, height = region
+            area = {"left": left, "top": top, "width": width, "height": height}
+        else:
+            area = grabber.monitors[monitor]
+        # mss returns BGRA; reorder to RGB in one copy
+        return np.ascontiguousarray(np.asarray(grabber.grab(area))[:, :, 2::-1])
+
+    import pyautogui
+
+    image = pyautogui.screenshot(region=region)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.asarray(image)
+
+
+def active_window() -> str:
+    """Identifier of the focused window or app, or '' when it cannot be determined.
+
+    Windows reports the window title through PyAutoGUI. macOS falls back to
+    the frontmost application's name via AppKit (installed with PyAutoGUI's
+    pyobjc dependencies), and Linux/X11 to the active window's name via
+    ``xdotool`` when it is on PATH. Wayland, or X11 without ``xdotool``,
+    yields ''.
+    """
+    import pyautogui
+
+    try:
+        title = pyautogui.getActiveWindowTitle()
+        if title:
+            return title
+    except Exception:
+        pass
+
+    if sys.platform == "darwin":
+        try:
+            from AppKit import NSWorkspace
+
+            app = NSWorkspace.sharedWorkspace().frontmostApplication()
+            return str(app.bundleIdentifier() or app.localizedName() or "") if app is not None else ""
+        except Exception:
+            return ""
+    if shutil.which("xdotool"):
+        try:
+            result = subprocess.run(["xdotool", "getactivewindow", "getwindowname"],
+                                    capture_output=True, text=True, timeout=1.0)
+            return result.stdout.strip() if result.returncode == 0 else ""
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return ""
+
+
+def _capture_loop(name: str, slots: int, height: int, width: int, interval: float, stop_event):
+    """Entry point of the capture process: grab frames until told to stop."""
+    ring = FrameRing.attach(name, slots, height, width)
+    ring.header[_STATUS] = _STATUS_RUNNING
+    try:
+        while not stop_event.is_set():
+            started = time.time()
+            frame = grab_screen()
+            if frame.shape != (height, width, 3):
+                # Resolution changed; the server falls back to direct capture
+                # until the backend is restarted with a correctly sized ring.
+                ring.header[_STATUS] = _STATUS_RESIZED
+                stop_event.wait(1.0)
+                continue
+            ring.header[_STATUS] = _STATUS_RUNNING
+            ring.write(frame, started)
+            remaining = interval - (time.time() - started)
+            if remaining > 0:
+                stop_event.wait(remaining)
+    finally:
+        ring.header[_STATUS] = _STATUS_STOPPED
+        ring.close()
+
+
+class CaptureDaemon:
+    """Owns the capture process and the shared-memory ring it writes into.
+
+    The ring is sized from a probe screenshot taken in ``start()``. Frames
+    are read back with ``latest()``, which returns ``None`` whenever the
+    daemon is not running or has nothing fresh enough, so callers can fall
+    back to a direct ``pyautogui.screenshot()``.
+
+    Args:
+        slots: Number of frames held in the ring.
+        interval: Minimum seconds between captures.
+    """
+
+    def __init__(self, slots: int = 4, interval: float = 0.05):
+        self.slots = max(2, slots)
+        self.interval = interval
+        self.ring: Optional[FrameRing] = None
+        self.process: Optional[mp.Process] = None
+        self.stop_event = None
+
+    def start(self):
+        """Allocate the ring and launch the capture process."""
+        if self.is_running():
+            return
+
+        height, width = grab_screen().shape[:2]
+        self.ring = FrameRing.create(self.slots, height, width)
+
+        ctx = mp.get_context("spawn")
+        self.stop_event = ctx.Event()
+        self.process = ctx.Process(
+            target=_capture_loop,
+            args=(self.ring.shm.name, self.slots, height, width, self.interval, self.stop_event),
+            name="remoto-capture",
+            daemon=True,
+        )
+        self.process.start()
+        print(f"[OK] Capture daemon started ({width}x{height}, {self.slots} slots, pid {self.process.pid})")
+
+    def stop(self):
+        """Stop the capture process and free the shared block."""
+        if self.process is not None:
+            self.stop_event.set()
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.kill()
+            self.process = None
+
+        if self.ring is not None:
+            shm = self.ring.shm
+            self.ring.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.ring = None
+
+    def is_running(self) -> bool:
+        """True if the capture process is alive and writing frames."""
+        return (
+            self.process is not None
+            and self.process.is_alive()
+            and self.ring is not None
+            and self.ring.status == _STATUS_RUNNING
+        )
+
+    def latest(self, max_age: float = 0.5) -> Optional[Tuple[np.ndarray, int]]:
+        """Return (frame_view, seq) for the newest frame, or None if unavailable.
+
+        Args:
+            max_age: Reject frames whose capture started more than this many
+                seconds ago, so actions that just changed the screen are not
+                answered with a stale frame.
+        """
+        if not self.is_running():
+            return None
+        latest = self.ring.latest()
+        if latest is None:
+            return None
+        frame, seq, captured_at = latest
+        if time.time() - captured_at > max_age:
+            return None
+        return frame, seq
+
+    def is_intact(self, seq: int) -> bool:
+        """True if the frame returned for ``seq`` was not overwritten while in use."""
+        return self.ring is not None and self.ring.is_intact(seq)
+
+
+def from_env() -> CaptureDaemon:
+    """Build a CaptureDaemon configured from REMOTO_CAPTURE_* environment variables."""
+    return CaptureDaemon(
+        slots=int(os.getenv("REMOTO_CAPTURE_SLOTS", "4")),
+        interval=float(os.getenv("REMOTO_CAPTURE_INTERVAL", "0.05")),
+    )
@@ -0,0 +1,259 @@
+"""
+In-process task complexity classifier for model routing.
+
+Every command used to pay a ``create_thread`` + ``add_message`` round trip to
+a small LLM just to pick simple/medium/complex. ``ComplexityClassifier`` sits
+in front of that call: keyword and verb rules built around the tools in
+``TOOL_DEFINITIONS`` count the actions a command asks for, and an LRU cache
+maps normalized command text to its label. The remote classifier is only
+consulted when the rules are not confident.
+
+In record mode the remote classifier is asked for every new command and both
+labels are appended to ``~/.remoto/data/classifier.jsonl``, so the rules can
+be checked offline with ``python -m benchmarks.eval_classifier``.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+MODEL_MAP = {
+    "simple": ("google", "gemini-2.5-flash-lite"),
+    "medium": ("openai", "gpt-4.1"),
+    "complex": ("anthropic", "claude-sonnet-4-20250514"),
+}
+
+MODES = ("local", "remote", "record")
+
+DEFAULT_RECORD_PATH = Path.home() / ".remoto" / "data" / "classifier.jsonl"
+
+# Verbs that start one tool action, grouped by the tool they usually map to
+ACTION_VERBS = {
+    "launch_app": ("open", "launch", "start", "run"),
+    "navigate_url": ("go to", "navigate", "visit", "browse"),
+    "find_and_click": ("click", "tap", "select", "choose", "toggle"),
+    "type_text": ("type", "write", "enter", "input", "fill"),
+    "press_key": ("press", "hit"),
+    "press_hotkey": ("copy", "paste", "cut", "undo", "redo", "save", "close", "switch",
+                     "minimize", "maximize", "refresh", "reload", "zoom", "lock", "mute"),
+    "scroll_page": ("scroll", "page up", "page down"),
+    "execute_workflow": ("workflow", "mode"),
+    "list_workflows": ("list",),
+}
+
+# Verbs that expand to several tool calls on their own (e.g. search = click box, type, enter)
+COMPOUND_VERBS = {"search": 2, "find": 2, "look up": 2, "reply": 2, "send": 2, "email": 2, "message": 2,
+                  "download": 2, "upload": 3, "install": 3, "rename": 3, "move": 2}
+
+# Words that signal planning or open-ended reasoning rather than a fixed action sequence
+PLANNING_WORDS = ("plan", "research", "compare", "organize", "organise", "figure out", "summarize",
+                  "summarise", "analyze", "analyse", "debug", "fix", "troubleshoot", "draft", "compose",
+                  "decide", "recommend", "create a workflow", "create workflow", "teach", "learn how",
+                  "every time", "whenever", "for each", "all of")
+
+# Clause separators: commas, semicolons, sentence breaks and sequencing words
+_CLAUSE_SPLIT = re.compile(r"\s*(?:,|;|\.\s|\band then\b|\bthen\b|\band\b|\bafter that\b|\bafterwards\b|\bfinally\b|\bnext\b)\s*")
+
+_FILLER = re.compile(r"^(?:hey remoto|remoto|please|can you|could you|would you|i want you to|i need you to|go ahead and)\s+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, collapse whitespace, trim trailing punctuation and polite filler."""
+    text = " ".join(text.lower().split()).strip(" .!?")
+    previous = None
+    while previous != text:
+        previous = text
+        text = _FILLER.sub("", text)
+    return text
+
+
+def _has(text: str, phrase: str) -> bool:
+    return re.search(rf"\b{re.escape(phrase)}\b", text) is not None
+
+
+def _clause_actions(clause: str) -> Tuple[int, List[str]]:
+    """Return (estimated tool calls, matched verbs) for one clause."""
+    words = clause.split()
+    if not words:
+        return 0, []
+    for verb, steps in COMPOUND_VERBS.items():
+        if clause.startswith(verb):
+            return steps, [verb]
+    for tool, verbs in ACTION_VERBS.items():
+        for verb in verbs:
+            if clause.startswith(verb) or (tool == "execute_workflow" and _has(clause, verb)):
+                return 1, [verb]
+    return 0, []
+
+
+def classify_local(text: str) -> Dict[str, Any]:
+    """Classify a command with the keyword/verb rules.
+
+    Args:
+        text: Command text (normalized or raw).
+
+    Returns:
+        Dict with 'complexity', 'reasoning', 'steps' and 'confidence' (0-1).
+    """
+    text = normalize(text)
+    clauses = [c for c in _CLAUSE_SPLIT.split(text) if c]
+    steps = 0
+    unknown = 0
+    verbs: List[str] = []
+    for clause in clauses:
+        count, matched = _clause_actions(clause)
+        steps += count
+        verbs += matched
+        if not count:
+            unknown += 1
+
+    planning = [w for w in PLANNING_WORDS if _has(text, w)]
+    if planning:
+        complexity, confidence = "complex", 0.85
+        reasoning = f"Open-ended request ({', '.join(planning)})"
+    elif steps == 0:
+        complexity, confidence = "medium", 0.2
+        reasoning = "No known action verb"
+    elif steps == 1:
+        complexity = "simple"
+        confidence = 0.9 if len(text.split()) <= 8 else 0.65
+        reasoning = f"Single action ({verbs[0]})"
+    elif steps <= 3:
+        complexity, confidence = "medium", 0.8
+        reasoning = f"{steps} coordinated actions ({', '.join(verbs)})"
+    else:
+        complexity, confidence = "complex", 0.85
+        reasoning = f"{steps} actions ({', '.join(verbs)})"
+
+    # Clauses the rules could not read make the step count a guess
+    if steps and unknown:
+        confidence -= 0.15 * unknown
+
+    return {
+        "complexity": complexity,
+        "reasoning": reasoning,
+        "steps": steps,
+        "confidence": round(max(confidence, 0.0), 2),
+    }
+
+
+class ComplexityClassifier:
+    """Local-first complexity classifier with an LRU cache and remote fallback.
+
+    Args:
+        remote: Coroutine function taking the command text and returning the
+            remote classification dict (``classify_task_complexity``).
+        mode: 'local' (rules first, remote only below ``threshold``), 'remote'
+            (always ask the remote classifier) or 'record' (ask the remote
+            classifier for every new command and log both labels).
+        threshold: Minimum rule confidence to skip the remote call.
+        cache_size: Normalized commands remembered; 0 disables the cache.
+        record_path: JSONL file that record mode appends to.
+    """
+
+    def __init__(self, remote: Callable[[str], Awaitable[Dict[str, Any]]], mode: str = "local",
+                 threshold: float = 0.7, cache_size: int = 256, record_path: Optional[Path] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown classifier mode: {mode} (expected one of {MODES})")
+        self.remote = remote
+        self.mode = mode
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self.record_path = Path(record_path) if record_path else DEFAULT_RECORD_PATH
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.counts = {"cache": 0, "rules": 0, "remote": 0}
+        self._lock = threading.Lock()
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, classification: Dict[str, Any]):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self.cache[key] = classification
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def _record(self, text: str, key: str, local: Dict[str, Any], remote: Dict[str, Any]):
+        entry = {
+            "time": time.time(),
+            "text": text,
+            "normalized": key,
+            "remote": remote.get("complexity"),
+            "remote_reasoning": remote.get("reasoning"),
+            "local": local["complexity"],
+            "local_confidence": local["confidence"],
+        }
+        try:
+            self.record_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.record_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Warning: could not record classification: {e}")
+
+    @staticmethod
+    def _with_model(classification: Dict[str, Any], source: str) -> Dict[str, Any]:
+        result = dict(classification)
+        result["recommended_model"] = MODEL_MAP.get(result.get("complexity"), MODEL_MAP["medium"])
+        result["source"] = source
+        return result
+
+    async def classify(self, text: str) -> Dict[str, Any]:
+        """Classify a command, preferring the cache, then the rules, then the remote model.
+
+        Returns:
+            Dict with 'complexity', 'reasoning', 'recommended_model' (provider,
+            model) and 'source' ('cache', 'rules' or 'remote').
+        """
+        key = normalize(text)
+        cached = self._cached(key)
+        if cached is not None:
+            self.counts["cache"] += 1
+            return self._with_model(cached, "cache")
+
+        local = classify_local(key)
+        if self.mode == "local" and local["confidence"] >= self.threshold:
+            self.counts["rules"] += 1
+            self._store(key, local)
+            return self._with_model(local, "rules")
+
+        remote = await self.remote(text)
+        self.counts["remote"] += 1
+        if self.mode == "record":
+            self._record(text, key, local, remote)
+        if not remote.get("failed"):
+            self._store(key, {k: v for k, v in remote.items() if k != "recommended_model"})
+        return self._with_model(remote, "remote")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the /stats endpoint."""
+        total = sum(self.counts.values())
+        return {
+            "mode": self.mode,
+            **self.counts,
+            "entries": len(self.cache),
+            "remote_rate": round(self.counts["remote"] / total, 3) if total else 0.0,
+        }
+
+
+def from_env(remote: Callable[[str], Awaitable[Dict[str, Any]]]) -> ComplexityClassifier:
+    """Build the classifier from REMOTO_CLASSIFIER_* environment variables."""
+    record_path = os.getenv("REMOTO_CLASSIFIER_RECORD_PATH")
+    return ComplexityClassifier(
+        remote,
+        mode=os.getenv("REMOTO_CLASSIFIER", "local").lower(),
+        threshold=float(os.getenv("REMOTO_CLASSIFIER_THRESHOLD", "0.7")),
+        cache_size=int(os.getenv("REMOTO_CLASSIFIER_CACHE_SIZE", "256")),
+        record_path=Path(record_path).expanduser() if record_path else None,
+    )
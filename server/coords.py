@@ -0,0 +1,73 @@
+"""
+Mapping between screenshot coordinates and PyAutoGUI screen coordinates.
+
+The LLM and OCR work on a downscaled copy of the captured monitor whose
+aspect ratio matches the monitor, so x and y are scaled independently. The
+monitor's position on the virtual desktop gives an offset, and on high-DPI
+displays the physical screenshot pixels are converted to the logical points
+PyAutoGUI clicks in.
+"""
+
+from typing import Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+class CoordinateMap:
+    """Maps points in a screenshot image to screen coordinates and back.
+
+    Args:
+        image_size: (width, height) of the image the coordinates refer to.
+        source_rect: Physical-pixel (left, top, width, height) on the virtual
+            desktop that the image was captured from.
+        dpi_scale: Logical points per physical pixel (x, y).
+
+    Attributes:
+        scale_x: Logical points per image pixel horizontally.
+        scale_y: Logical points per image pixel vertically.
+        offset_x: Logical x of the image's left edge.
+        offset_y: Logical y of the image's top edge.
+    """
+
+    def __init__(self, image_size: Tuple[int, int], source_rect: Rect,
+                 dpi_scale: Tuple[float, float] = (1.0, 1.0)):
+        self.image_size = image_size
+        self.source_rect = source_rect
+        self.dpi_scale = dpi_scale
+
+        image_width, image_height = image_size
+        left, top, width, height = source_rect
+        self.pixel_scale_x = width / image_width
+        self.pixel_scale_y = height / image_height
+        self.scale_x = self.pixel_scale_x * dpi_scale[0]
+        self.scale_y = self.pixel_scale_y * dpi_scale[1]
+        self.offset_x = left * dpi_scale[0]
+        self.offset_y = top * dpi_scale[1]
+
+    def to_screen(self, x: float, y: float) -> Tuple[int, int]:
+        """Convert an image point to PyAutoGUI screen coordinates."""
+        return round(self.offset_x + x * self.scale_x), round(self.offset_y + y * self.scale_y)
+
+    def to_physical(self, x: float, y: float) -> Tuple[int, int]:
+        """Convert an image point to physical desktop pixels."""
+        left, top = self.source_rect[:2]
+        return round(left + x * self.pixel_scale_x), round(top + y * self.pixel_scale_y)
+
+    def from_physical(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert physical desktop pixels to (fractional) image coordinates."""
+        left, top = self.source_rect[:2]
+        return (x - left) / self.pixel_scale_x, (y - top) / self.pixel_scale_y
+
+    def region(self, x: int, y: int, width: int, height: int) -> Rect:
+        """Physical (left, top, width, height) under an image-space rectangle, clipped to the source."""
+        src_left, src_top, src_width, src_height = self.source_rect
+        left, top = self.to_physical(x, y)
+        right, bottom = self.to_physical(x + width, y + height)
+        left, top = max(left, src_left), max(top, src_top)
+        right, bottom = min(right, src_left + src_width), min(bottom, src_top + src_height)
+        return left, top, max(0, right - left), max(0, bottom - top)
+
+    def __repr__(self) -> str:
+        return (f"CoordinateMap(image={self.image_size[0]}x{self.image_size[1]}, "
+                f"scale=({self.scale_x:.3f}, {self.scale_y:.3f}), "
+                f"offset=({self.offset_x:.0f}, {self.offset_y:.0f}))")
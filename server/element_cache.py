@@ -0,0 +1,139 @@
+"""
+Memoized element locations for ``find_and_click``.
+
+Users repeat the same clicks ("click send", "click compose"), and an element
+OCR cannot read costs a vision-model round trip every time. ``ElementCache``
+remembers where an element was last clicked, keyed by its text and the
+active window, together with a perceptual hash of the pixels around it.
+Before a cached location is trusted, that neighbourhood is grabbed again at
+native resolution and re-hashed; a mismatch drops the entry and the normal
+OCR/vision search runs instead.
+
+The window comes from ``capture.active_window()`` (window title on Windows,
+frontmost app on macOS, ``xdotool`` on Linux/X11). Where it is unknown, for
+example on Wayland or without ``xdotool``, nothing is cached, so one app's
+"Send" is never clicked in another.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from server.coords import Rect
+
+# Neighbourhood hashed around a hit, in screenshot coordinates (width, height)
+NEIGHBOURHOOD = (64, 32)
+
+
+class CachedElement(NamedTuple):
+    screen: Tuple[int, int]
+    region: Rect
+    digest: bytes
+    method: str
+    stored_at: float
+
+
+def neighbourhood_hash(pixels: np.ndarray) -> bytes:
+    """Perceptual hash of an RGB patch: 32x16 grayscale thumbnail quantized to 32 levels."""
+    gray = cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY) if pixels.ndim == 3 else pixels
+    thumb = cv2.resize(gray, (32, 16), interpolation=cv2.INTER_AREA) >> 3
+    return hashlib.blake2b(thumb.tobytes(), digest_size=16).digest()
+
+
+class ElementCache:
+    """LRU cache with TTL of resolved element locations.
+
+    Args:
+        max_entries: Locations kept before the least recently used is evicted.
+        ttl: Seconds a location stays valid; 0 disables the cache.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[Tuple[str, str], CachedElement]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    @staticmethod
+    def key(element_text: str, window: str) -> Tuple[str, str]:
+        return " ".join(element_text.lower().split()), window
+
+    def get(self, element_text: str, window: str) -> Optional[CachedElement]:
+        """Return the unexpired entry for ``element_text`` in ``window``, or None."""
+        key = self.key(element_text, window)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at <= self.ttl:
+                self.entries.move_to_end(key)
+                return entry
+            if entry is not None:
+                del self.entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_skip(self):
+        """Count a lookup skipped because the active window is unknown (warns once)."""
+        with self._lock:
+            self.skipped += 1
+            first = self.skipped == 1
+        if first:
+            print("[WARNING] Element cache: active window unknown, so clicked locations are not cached "
+                  "(on Linux/X11, install xdotool)")
+
+    def invalidate(self, element_text: str, window: str):
+        """Drop an entry whose neighbourhood no longer matches."""
+        with self._lock:
+            if self.entries.pop(self.key(element_text, window), None) is not None:
+                self.stale += 1
+
+    def put(self, element_text: str, window: str, screen: Tuple[int, int], region: Rect,
+            digest: bytes, method: str):
+        """Remember where ``element_text`` was clicked, evicting the LRU entry when full."""
+        key = self.key(element_text, window)
+        with self._lock:
+            self.entries[key] = CachedElement(screen, region, digest, method, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the /stats endpoint."""
+        lookups = self.hits + self.misses + self.stale
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "skipped_no_window": self.skipped,
+            "entries": len(self.entries),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def from_env() -> ElementCache:
+    """Build the element cache from REMOTO_ELEMENT_CACHE_SIZE and REMOTO_ELEMENT_CACHE_TTL."""
+    return ElementCache(
+        max_entries=int(os.getenv("REMOTO_ELEMENT_CACHE_SIZE", "128")),
+        ttl=float(os.getenv("REMOTO_ELEMENT_CACHE_TTL", "600")),
+    )
@@ -0,0 +1,139 @@
+"""
+Screenshot encoding for the Remoto backend.
+
+Each captured frame is encoded exactly once into an ``EncodedFrame`` that is
+shared by every consumer of that frame: the HTTP response, the vision
+fallback in ``ToolExecutor`` and the verification upload in ``ask_backboard``.
+The codec is configurable; PNG uses a fast zlib level instead of Pillow's slow
+``optimize=True`` search, and JPEG/WebP trade a little fidelity for much
+smaller payloads over the tunnel.
+
+Frames stay as raw bytes in memory. Base64 text is only produced when a JSON
+response asks for it, and uploads that need a file path share one on-disk
+copy per frame, written to tmpfs (``/dev/shm``) when the host has one.
+"""
+
+import base64
+import io
+import os
+import tempfile
+import weakref
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+FORMATS = {
+    "png": ("PNG", "image/png", ".png"),
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+    "webp": ("WEBP", "image/webp", ".webp"),
+}
+
+
+def _spool_dir() -> str:
+    """Directory for on-disk frame copies: REMOTO_FRAME_DIR, else tmpfs, else the system temp dir."""
+    configured = os.getenv("REMOTO_FRAME_DIR")
+    if configured:
+        os.makedirs(configured, exist_ok=True)
+        return configured
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def _unlink_quietly(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class EncodedFrame:
+    """An encoded screenshot plus the metadata needed to upload or serve it.
+
+    Args:
+        data: Encoded image bytes.
+        codec: Key into ``FORMATS`` ('png', 'jpeg' or 'webp').
+        width: Image width in pixels.
+        height: Image height in pixels.
+    """
+
+    def __init__(self, data: bytes, codec: str, width: int, height: int):
+        self.data = data
+        self.codec = codec
+        self.width = width
+        self.height = height
+        self._base64: Optional[str] = None
+        self._path: Optional[str] = None
+
+    @property
+    def mime_type(self) -> str:
+        return FORMATS[self.codec][1]
+
+    @property
+    def extension(self) -> str:
+        return FORMATS[self.codec][2]
+
+    @property
+    def base64(self) -> str:
+        """Base64 text of the encoded bytes, computed on first use."""
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.data).decode('utf-8')
+        return self._base64
+
+    def path(self) -> str:
+        """Path of this frame's single on-disk copy, written on first use.
+
+        The Backboard client only uploads files by path, so the vision
+        fallback and the verification step share this copy instead of each
+        writing their own temp file. It is removed when the frame is
+        garbage-collected (or at interpreter exit).
+        """
+        if self._path is None:
+            fd, path = tempfile.mkstemp(prefix="remoto-frame-", suffix=self.extension, dir=_spool_dir())
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.data)
+            self._path = path
+            weakref.finalize(self, _unlink_quietly, path)
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+def encode_frame(image: np.ndarray, codec: Optional[str] = None, quality: Optional[int] = None,
+                 png_level: Optional[int] = None) -> EncodedFrame:
+    """Encode an RGB frame with the configured codec.
+
+    Args:
+        image: RGB array of shape (height, width, 3).
+        codec: 'png', 'jpeg' or 'webp' (default: REMOTO_SCREENSHOT_FORMAT, else 'png').
+        quality: JPEG/WebP quality 1-100 (default: REMOTO_SCREENSHOT_QUALITY, else 85).
+        png_level: zlib level 0-9 for PNG (default: REMOTO_SCREENSHOT_PNG_LEVEL, else 1).
+
+    Returns:
+        The encoded frame.
+    """
+    codec = (codec or os.getenv("REMOTO_SCREENSHOT_FORMAT", "png")).lower()
+    if codec == "jpg":
+        codec = "jpeg"
+    if codec not in FORMATS:
+        raise ValueError(f"Unsupported screenshot format: {codec}")
+    if quality is None:
+        quality = int(os.getenv("REMOTO_SCREENSHOT_QUALITY", "85"))
+    if png_level is None:
+        png_level = int(os.getenv("REMOTO_SCREENSHOT_PNG_LEVEL", "1"))
+
+    pil_format = FORMATS[codec][0]
+    buffered = io.BytesIO()
+    pil_image = Image.fromarray(image)
+    if codec == "png":
+        pil_image.save(buffered, format=pil_format, compress_level=png_level)
+    elif codec == "webp":
+        # method=0 is libwebp's fastest encoder setting
+        pil_image.save(buffered, format=pil_format, quality=quality, method=0)
+    else:
+        pil_image.save(buffered, format=pil_format, quality=quality)
+
+    height, width = image.shape[:2]
+    return EncodedFrame(buffered.getvalue(), codec, width, height)
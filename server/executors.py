@@ -0,0 +1,113 @@
+"""
+Bounded executors for blocking work in the Remoto backend.
+
+Screen capture, OCR and PyAutoGUI input are all synchronous. Running them
+directly inside the FastAPI coroutines stalls the event loop, so ``/health``,
+``/config`` and static files stop answering while a command runs. Each stage
+gets its own small thread pool instead, and coroutines await it with
+``run_in``.
+
+Mouse and keyboard input goes through ``InputExecutor``: one thread that owns
+the desktop's input devices, runs actions strictly in submission order and
+times each one (queue wait and run time) for the /stats endpoint.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict
+
+# Screenshot capture + OCR; more than one worker lets overlapping requests proceed
+SCREEN = ThreadPoolExecutor(
+    max_workers=int(os.getenv("REMOTO_SCREEN_WORKERS", "2")),
+    thread_name_prefix="remoto-screen",
+)
+
+
+class InputExecutor(ThreadPoolExecutor):
+    """Single-threaded, FIFO executor that owns the mouse and keyboard.
+
+    Actions run one at a time in the order they were submitted, so input
+    from overlapping commands never interleaves. ``submit_async`` enqueues
+    an action immediately and returns an awaitable future, letting a caller
+    queue several actions in order before awaiting any of them.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=1, thread_name_prefix="remoto-input")
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.queued = 0
+        self._timing_lock = threading.Lock()
+
+    def _record(self, name: str, waited: float, ran: float):
+        with self._timing_lock:
+            self.queued -= 1
+            timing = self.timings.setdefault(name, {"count": 0, "run": 0.0, "max_run": 0.0, "wait": 0.0})
+            timing["count"] += 1
+            timing["run"] += ran
+            timing["max_run"] = max(timing["max_run"], ran)
+            timing["wait"] += waited
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        """Queue ``fn(*args, **kwargs)`` behind earlier actions and time it."""
+        name = getattr(fn, "__name__", "action")
+        queued_at = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(name, started - queued_at, time.perf_counter() - started)
+
+        with self._timing_lock:
+            self.queued += 1
+        try:
+            return super().submit(timed)
+        except RuntimeError:
+            with self._timing_lock:
+                self.queued -= 1
+            raise
+
+    def submit_async(self, fn, *args, **kwargs) -> "asyncio.Future":
+        """Enqueue an action now and return a future the running event loop can await."""
+        return asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    async def run(self, fn, *args, **kwargs) -> Any:
+        """Run an action after everything queued before it and return its result."""
+        return await self.submit_async(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-action counts and timings (milliseconds) for the /stats endpoint."""
+        with self._timing_lock:
+            return {
+                "queued": self.queued,
+                "actions": {
+                    name: {
+                        "count": int(t["count"]),
+                        "avg_ms": round(t["run"] / t["count"] * 1000, 1),
+                        "max_ms": round(t["max_run"] * 1000, 1),
+                        "avg_wait_ms": round(t["wait"] / t["count"] * 1000, 1),
+                    }
+                    for name, t in self.timings.items()
+                },
+            }
+
+
+# Mouse and keyboard; a single worker keeps input on one desktop strictly serialized
+INPUT = InputExecutor()
+
+
+async def run_in(executor: ThreadPoolExecutor, fn, *args, **kwargs):
+    """Run a blocking callable on ``executor`` and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown():
+    """Stop accepting work and let running tasks finish."""
+    SCREEN.shutdown(wait=False, cancel_futures=True)
+    INPUT.shutdown(wait=False, cancel_futures=True)
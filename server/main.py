@@ -6,34 +6,37 @@ screen capture with OCR, routes AI requests through Backboard.io, and executes
 tool calls (keyboard/mouse automation) on the host machine.
 """
 
-import pyautogui
-import io
 import os
 import time
-import base64
 import re
 import secrets
 import json
 import asyncio
-from PIL import Image
 from dotenv import load_dotenv
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import uvicorn
-from typing import List, Optional, Tuple, Dict, Any
-import tempfile
-import pytesseract
-import cv2
+from typing import List, Optional, Tuple, Dict, Any, Callable, Awaitable
+from collections import OrderedDict
+import uuid
 import numpy as np
+import pytesseract
 import sys
 import shutil
 from pathlib import Path
 from backboard import BackboardClient
-from server.tools import TOOL_DEFINITIONS, ToolExecutor
+from server.tools import ToolExecutor
+from server.batch import ToolCall
+from server.registry import plugin_dir, registry as tool_registry
+from server import capture, classifier, executors, metrics, ocr, preprocess
+from server.ocr_index import OcrIndex
+from server.encoding import EncodedFrame, encode_frame
+from server.coords import CoordinateMap
+from server.thread_pool import UtilityThreadPool
 
 load_dotenv()
 
@@ -91,6 +94,37 @@ backboard_client = None
 assistant = None
 tool_executor = ToolExecutor()
 
+# ============= SCREEN CAPTURE =============
+# Background capture process feeding a shared-memory frame ring; disabled with REMOTO_CAPTURE_DAEMON=0
+capture_daemon = capture.from_env()
+
+def sample_screen() -> np.ndarray:
+    """Current screen for settle checks: the newest ring frame when fresh, else a direct capture."""
+    captured = capture_daemon.latest(max_age=0.1)
+    return captured[0] if captured is not None else capture.grab_screen()
+
+# Waits after input sample the ring instead of grabbing the screen themselves
+tool_executor.settler.sample = sample_screen
+
+# OCR pass used by get_screenshot_with_ocr (REMOTO_OCR_MODE=full|incremental|banded)
+ocr_engine = ocr.from_env()
+
+# Frame resize + OCR preprocessing (REMOTO_OCR_PREPROCESS=gray|binary|sharpen)
+preprocessor = preprocess.from_env()
+
+# Screenshot/OCR results keyed by a perceptual frame hash (REMOTO_OCR_CACHE_TTL=0 disables)
+ocr_cache = ocr.cache_from_env()
+
+# Fresh single-use Backboard threads for classification and vision queries (warmed at startup)
+classifier_threads = UtilityThreadPool("Classifier", size=int(os.getenv("REMOTO_THREAD_POOL_SIZE", "2")))
+vision_threads = UtilityThreadPool("Vision", size=int(os.getenv("REMOTO_VISION_THREAD_POOL_SIZE", "1")))
+
+# Local-first model routing; the remote LLM classifier is only asked when the rules are unsure
+# (REMOTO_CLASSIFIER=local|remote|record)
+task_classifier = classifier.from_env(
+    lambda text: classify_task_complexity(text, backboard_client, assistant)
+)
+
 # ============= FASTAPI APP =============
 app = FastAPI(title="Remoto AI Backend")
 
@@ -105,6 +139,37 @@ app.add_middleware(
 # Map frontend thread_ids to Backboard thread_ids (for persistent memory)
 thread_id_mapping: Dict[str, str] = {}  # frontend_id -> backboard_id
 
+# Recent final screenshots referenced by streamed responses (frame_id -> EncodedFrame)
+screenshot_store: "OrderedDict[str, EncodedFrame]" = OrderedDict()
+SCREENSHOT_STORE_SIZE = 8
+
+# Progress callback for streamed commands: await on_event(event_name, data)
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# Commands share tool_executor's OCR, vision and coordinate context (and the desktop),
+# so they run one at a time. Created on first use so it binds to the server's event loop.
+_command_lock: Optional[asyncio.Lock] = None
+
+def command_lock() -> asyncio.Lock:
+    """Lock held by ``process_command`` for the whole of each command."""
+    global _command_lock
+    if _command_lock is None:
+        _command_lock = asyncio.Lock()
+    return _command_lock
+
+def store_screenshot(frame: EncodedFrame) -> str:
+    """Keep a screenshot for ``/screenshot/{frame_id}`` and return its ID."""
+    frame_id = uuid.uuid4().hex
+    screenshot_store[frame_id] = frame
+    while len(screenshot_store) > SCREENSHOT_STORE_SIZE:
+        screenshot_store.popitem(last=False)
+    return frame_id
+
+async def _emit(on_event: Optional[EventCallback], event: str, data: Dict[str, Any]):
+    """Report a progress event if the caller is streaming."""
+    if on_event is not None:
+        await on_event(event, data)
+
 # ============= SERVE STATIC FILES =============
 app.mount("/static", StaticFiles(directory="server/static"), name="static")
 
@@ -130,7 +195,26 @@ async def health_check():
     """Health check endpoint for monitoring"""
     return {"status": "healthy", "service": "remote-ai-backend"}
 
-# ============= SSE ENDPOINT =============
+# ============= STATS =============
+@app.get("/stats")
+async def get_stats(authenticated: bool = Depends(verify_password)):
+    """Report pipeline counters (OCR/element cache hits, classifier sources, utility thread pools, settle waits, input timings, per-tool latency)"""
+    return {
+        "ocr_cache": ocr_cache.stats(),
+        "classifier": task_classifier.stats(),
+        "threads": {"classifier": classifier_threads.stats(), "vision": vision_threads.stats()},
+        "element_cache": tool_executor.element_cache.stats(),
+        "settle": tool_executor.settler.stats(),
+        "input": executors.INPUT.stats(),
+        "tools": tool_registry.stats(),
+    }
+
+# ============= METRICS =============
+@app.get("/metrics")
+async def get_metrics(authenticated: bool = Depends(verify_password)):
+    """Expose pipeline latency histograms and counters in the Prometheus text format"""
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 # ============= MODELS =============
 class CommandRequest(BaseModel):
     text: str
@@ -189,8 +273,9 @@ YOU MUST USE TOOLS FOR ALL ACTIONS
 - Only provide confirmation after tool execution
 
 OCR & COORDINATES:
-- You receive OCR text with positions from screenshot (1280x720)
+- You receive OCR text with positions from the screenshot (its size is given with the OCR text)
 - Use OCR coordinates with click_position tool - system auto-scales to actual resolution
+- Text too small to read? Call read_screen_region on that area to OCR it at full resolution
 - Example: OCR shows "Submit" at (850, 600) → call click_position(x=850, y=600)
 
 VISUAL FEEDBACK AFTER TOOL EXECUTION:
@@ -242,62 +327,87 @@ REMEMBER:
 - MUST execute actions using tools, not describe them
 - Combine related tool calls for efficiency"""
 
-def get_screenshot_with_ocr() -> Tuple[str, str, float]:
+def get_screenshot_with_ocr() -> Tuple[EncodedFrame, OcrIndex, CoordinateMap]:
     """Capture a screenshot of the desktop and extract text positions via OCR.
 
-    The screenshot is resized to 1280x720 for consistent coordinate space,
-    then Tesseract OCR extracts visible text with bounding-box positions.
-    Coordinates returned in OCR text are relative to the resized image;
-    the scale factor maps them back to the actual screen resolution.
+    The frame is taken from the capture daemon's shared-memory ring when it
+    is running (falling back to a direct ``pyautogui.screenshot()``) and
+    area-resized to fit within 1280x720, keeping the monitor's aspect ratio
+    so text is not stretched. The grayscale
+    OCR input is prepared by the configured preprocessing preset, then
+    Tesseract OCR extracts visible text with bounding-box positions.
+    In incremental mode only the tiles that changed since the previous frame
+    are re-OCR'd, and a frame identical to a recently seen one is answered
+    from the OCR cache without running Tesseract at all.
+    OCR coordinates are relative to the resized image; the coordinate map
+    converts them to screen coordinates with separate x/y scales, the
+    monitor's desktop offset and the display's DPI scaling.
 
     Returns:
-        A tuple of (screenshot_base64, ocr_text_with_positions, scale_factor)
-        where ocr_text_with_positions has lines like '"Submit" at (850, 600)'.
+        A tuple of (screenshot, ocr_index, coord_map) where ``screenshot``
+        is the frame encoded once with the configured codec and
+        ``ocr_index.text`` renders lines like '"Submit" at (850, 600)'.
     """
-    screenshot = pyautogui.screenshot()
-    original_width, original_height = screenshot.size
-    
-    target_width = 1280
-    target_height = 720
-    
-    screenshot_resized = screenshot.resize((target_width, target_height), Image.Resampling.LANCZOS)
-    
-    screenshot_cv = cv2.cvtColor(np.array(screenshot_resized), cv2.COLOR_RGB2BGR)
+    with metrics.STAGE_SECONDS.time(stage="capture"):
+        captured = capture_daemon.latest()
+        if captured is not None:
+            screenshot, frame_seq = captured
+        else:
+            screenshot, frame_seq = capture.grab_screen(), None
+        # Resize straight from the (possibly shared-memory) frame into a reusable buffer
+        screenshot_resized = preprocessor.resize(screenshot)
+        if frame_seq is not None and not capture_daemon.is_intact(frame_seq):
+            # The capture process lapped the ring while we were reading; take a direct capture instead
+            screenshot = capture.grab_screen()
+            screenshot_resized = preprocessor.resize(screenshot)
     
-    ocr_data = pytesseract.image_to_data(screenshot_cv, output_type=pytesseract.Output.DICT)
+    resized_height, resized_width = screenshot_resized.shape[:2]
+    coord_map = CoordinateMap(
+        (resized_width, resized_height),
+        capture.monitor_rect(screenshot.shape),
+        capture.dpi_scale(screenshot.shape),
+    )
     
-    ocr_info = []
-    n_boxes = len(ocr_data['text'])
-    for i in range(n_boxes):
-        text = ocr_data['text'][i].strip()
-        if text:
-            x = ocr_data['left'][i]
-            y = ocr_data['top'][i]
-            w = ocr_data['width'][i]
-            h = ocr_data['height'][i]
-            conf = ocr_data['conf'][i]
-            
-            center_x = x + w // 2
-            center_y = y + h // 2
-            
-            if conf > 30:
-                ocr_info.append(f'"{text}" at ({center_x}, {center_y})')
+    screenshot_gray = preprocessor.gray(screenshot_resized)
+    if ocr_cache.enabled:
+        cache_key = ocr_cache.frame_hash(screenshot_gray) + repr(coord_map.source_rect).encode()
+        cached = ocr_cache.get(cache_key)
+        metrics.OCR_CACHE.inc(result="hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
     
-    ocr_text = "\n".join(ocr_info) if ocr_info else "No text detected"
+    with metrics.STAGE_SECONDS.time(stage="ocr"):
+        ocr_index = OcrIndex(ocr_engine(preprocessor.for_ocr(screenshot_gray)))
     
-    buffered = io.BytesIO()
-    screenshot_resized.save(buffered, format="PNG", optimize=True, quality=85)
-    screenshot_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
+    with metrics.STAGE_SECONDS.time(stage="encode"):
+        screenshot_encoded = encode_frame(screenshot_resized)
     
-    scale_factor = original_width / target_width
+    result = (screenshot_encoded, ocr_index, coord_map)
+    if ocr_cache.enabled:
+        ocr_cache.put(cache_key, result)
     
-    return screenshot_base64, ocr_text, scale_factor
+    return result
+
+async def get_screenshot_with_ocr_async() -> Tuple[EncodedFrame, OcrIndex, CoordinateMap]:
+    """Run ``get_screenshot_with_ocr`` on the screen executor so the event loop stays free."""
+    return await executors.run_in(executors.SCREEN, get_screenshot_with_ocr)
+
+tool_executor.set_screen_reader(get_screenshot_with_ocr_async)
+
+async def classify_command(text: str) -> Dict[str, Any]:
+    """Classify a command with ``task_classifier``, recording its latency and outcome."""
+    with metrics.STAGE_SECONDS.time(stage="classification"):
+        classification = await task_classifier.classify(text)
+    metrics.CLASSIFICATIONS.inc(complexity=classification.get("complexity", "unknown"),
+                                source=classification.get("source", "remote"))
+    return classification
 
 async def classify_task_complexity(user_message: str, backboard_client, assistant) -> dict:
     """Use a lightweight LLM to classify task complexity and select the optimal model.
 
-    Sends the user's message to Gemini Flash Lite for fast classification into
-    simple/medium/complex, then maps each level to a provider and model:
+    Sends the user's message to Gemini Flash Lite, on a pooled utility thread,
+    for fast classification into simple/medium/complex, then maps each level
+    to a provider and model:
       - simple  -> google/gemini-2.5-flash-lite
       - medium  -> openai/gpt-4.1
       - complex -> anthropic/claude-sonnet-4
@@ -331,16 +441,15 @@ Respond ONLY with valid JSON in this exact format:
 JSON response:"""
 
     try:
-        temp_thread = await backboard_client.create_thread(assistant_id=assistant.assistant_id)
-        
-        response = await backboard_client.add_message(
-            thread_id=str(temp_thread.thread_id),
-            content=classification_prompt,
-            llm_provider="google",
-            model_name="gemini-2.5-flash-lite",
-            memory="off",
-            stream=False
-        )
+        async with classifier_threads.borrow() as utility_thread_id:
+            response = await backboard_client.add_message(
+                thread_id=utility_thread_id,
+                content=classification_prompt,
+                llm_provider="google",
+                model_name="gemini-2.5-flash-lite",
+                memory="off",
+                stream=False
+            )
         
         content = response.content.strip()
         
@@ -350,14 +459,8 @@ JSON response:"""
         
         classification = json.loads(content)
         
-        model_map = {
-            "simple": ("google", "gemini-2.5-flash-lite"),
-            "medium": ("openai", "gpt-4.1"),
-            "complex": ("anthropic", "claude-sonnet-4-20250514")
-        }
-        
         complexity = classification.get("complexity", "medium")
-        classification["recommended_model"] = model_map.get(complexity, ("openai", "gpt-4o"))
+        classification["recommended_model"] = classifier.MODEL_MAP.get(complexity, ("openai", "gpt-4o"))
         
         return classification
         
@@ -367,10 +470,12 @@ JSON response:"""
         return {
             "complexity": "simple",
             "reasoning": "Classification failed, defaulting to simple model",
-            "recommended_model": ("google", "gemini-2.5-flash-lite")
+            "recommended_model": ("google", "gemini-2.5-flash-lite"),
+            "failed": True
         }
 
-async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, thread_id: str, scale_factor: float) -> tuple[str, str, str, dict]:
+async def ask_backboard(user_message: str, screenshot: EncodedFrame, ocr_index: OcrIndex, thread_id: str, coord_map: CoordinateMap,
+                        classification: Optional[dict] = None, on_event: Optional[EventCallback] = None) -> tuple[str, str, str, dict]:
     """Send a command to Backboard.io and execute any returned tool calls.
 
     Manages thread creation/reuse, runs the complexity classifier to pick the
@@ -383,17 +488,21 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
 
     Args:
         user_message: Command text from the user.
-        screenshot_b64: Base64-encoded PNG screenshot of the current screen.
-        ocr_text: OCR-extracted text with coordinates from the screenshot.
+        screenshot: Encoded screenshot of the current screen.
+        ocr_index: OCR words with coordinates from the screenshot.
         thread_id: Frontend thread ID for conversation continuity (or empty for new).
-        scale_factor: Ratio of actual screen width to the 1280px OCR image width.
+        coord_map: Maps screenshot/OCR coordinates to screen coordinates.
+        classification: Result of ``task_classifier.classify`` if the caller
+            already ran it (e.g. concurrently with OCR); classified here otherwise.
+        on_event: Optional progress callback; receives 'classification',
+            'tool_call', 'tool_result', 'assistant' and 'status' events.
 
     Returns:
         Tuple of (assistant_response, full_response, thread_id, analysis_data).
     """
     global backboard_client, assistant, tool_executor, thread_id_mapping
     
-    context_text = f"[Current screenshot attached]\n\nDetected text on screen:\n{ocr_text}\n\nCurrent user request: \"{user_message}\""
+    context_text = f"[Current screenshot attached ({screenshot.width}x{screenshot.height})]\n\nDetected text on screen:\n{ocr_index.text}\n\nCurrent user request: \"{user_message}\""
     
     frontend_thread_id = thread_id
     backboard_thread_id = None
@@ -413,10 +522,11 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
     
     thread_id = frontend_thread_id
     
-    tool_executor.set_ocr_context(ocr_text, scale_factor)
-    tool_executor.set_vision_context(screenshot_b64, backboard_thread_id)
+    tool_executor.set_ocr_context(ocr_index, coord_map)
+    tool_executor.set_vision_context(screenshot, backboard_thread_id)
 
-    classification = await classify_task_complexity(user_message, backboard_client, assistant)
+    if classification is None:
+        classification = await classify_command(user_message)
     llm_provider, model_name = classification["recommended_model"]
     
     print(f"\n{'='*60}")
@@ -424,17 +534,26 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
     print(f"{'='*60}")
     print(f"Complexity: {classification['complexity'].upper()}")
     print(f"Reasoning: {classification['reasoning']}")
+    print(f"Classified by: {classification.get('source', 'remote')}")
     print(f"Selected Model: {llm_provider}/{model_name}")
     print(f"{'='*60}\n")
+    await _emit(on_event, "classification", {
+        "complexity": classification["complexity"],
+        "reasoning": classification.get("reasoning", ""),
+        "model": f"{llm_provider}/{model_name}",
+        "source": classification.get("source", "remote"),
+    })
+    await _emit(on_event, "status", {"stage": "thinking"})
     
-    response = await backboard_client.add_message(
-        thread_id=backboard_thread_id,
-        content=context_text,
-        llm_provider=llm_provider,
-        model_name=model_name,
-        memory="Auto",
-        stream=False
-    )
+    with metrics.STAGE_SECONDS.time(stage="llm_turn"):
+        response = await backboard_client.add_message(
+            thread_id=backboard_thread_id,
+            content=context_text,
+            llm_provider=llm_provider,
+            model_name=model_name,
+            memory="Auto",
+            stream=False
+        )
     
     max_iterations = 10
     iteration = 0
@@ -447,6 +566,8 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
             print(f"\n--- Tool Execution Step {iteration} ---")
         
         tool_outputs = []
+        calls = []
+        call_ids = []
         
         for tool_call in response.tool_calls:
             try:
@@ -480,9 +601,15 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
                 continue
             
             print(f"Executing tool: {function_name} with args: {function_args}")
-            
-            result = await tool_executor.execute(function_name, function_args)
+            await _emit(on_event, "tool_call", {"tool": function_name, "args": function_args})
+            calls.append(ToolCall(function_name, function_args))
+            call_ids.append(tool_call_id)
+        
+        # Run the whole turn together: consecutive keystrokes go out as one input burst
+        async for index, result in tool_executor.execute_batch(calls):
+            function_name, function_args = calls[index]
             print(f"Tool result: {result}")
+            await _emit(on_event, "tool_result", {"tool": function_name, "args": function_args, "result": result})
             
             all_tool_results.append({
                 "tool": function_name,
@@ -491,16 +618,17 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
             })
             
             tool_outputs.append({
-                "tool_call_id": tool_call_id,
+                "tool_call_id": call_ids[index],
                 "output": json.dumps(result)
             })
         
         try:
-            response = await backboard_client.submit_tool_outputs(
-                thread_id=backboard_thread_id,
-                run_id=response.run_id,
-                tool_outputs=tool_outputs
-            )
+            with metrics.STAGE_SECONDS.time(stage="llm_turn"):
+                response = await backboard_client.submit_tool_outputs(
+                    thread_id=backboard_thread_id,
+                    run_id=response.run_id,
+                    tool_outputs=tool_outputs
+                )
             
             if response.status == 'REQUIRES_ACTION':
                 pass
@@ -557,38 +685,33 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
     if iteration > 0:
         print(f"Final response after {iteration} tool execution step(s): {full_response[:200]}...")
     
+    tag_match = re.search(r'<voice>(.*?)</voice>', full_response, re.DOTALL)
+    assistant_response = tag_match.group(1).strip() if tag_match else full_response
+    assistant_response = re.sub(r'<[^>]+>', '', assistant_response).strip()
+    await _emit(on_event, "assistant", {"message": assistant_response})
+    
     if iteration > 0 and all_tool_results:
         try:
-            await asyncio.sleep(0.5)
-            final_screenshot_b64, final_ocr_text, _ = get_screenshot_with_ocr()
-            
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.png', delete=False) as temp_file:
-                temp_file.write(base64.b64decode(final_screenshot_b64))
-                temp_screenshot_path = temp_file.name
+            with metrics.STAGE_SECONDS.time(stage="verification"):
+                await _emit(on_event, "status", {"stage": "verifying"})
+                await tool_executor.settler.wait_async(label="verification screenshot")
+                final_screenshot, final_ocr_index, _ = await get_screenshot_with_ocr_async()
             
-            executed_tools = [f"{r['tool']}({json.dumps(r['args'])})" for r in all_tool_results]
-            verification_message = f"FINAL SCREENSHOT - TASK VERIFICATION:\n\nI completed these actions: {', '.join(executed_tools)}\n\nHere's the final state of the screen:\n\nDetected text on screen:\n{final_ocr_text}\n\nPlease verify if the user's request was completed successfully by looking at this screenshot."
+                executed_tools = [f"{r['tool']}({json.dumps(r['args'])})" for r in all_tool_results]
+                verification_message = f"FINAL SCREENSHOT - TASK VERIFICATION:\n\nI completed these actions: {', '.join(executed_tools)}\n\nHere's the final state of the screen:\n\nDetected text on screen:\n{final_ocr_index.text}\n\nPlease verify if the user's request was completed successfully by looking at this screenshot."
             
-            await backboard_client.add_message(
-                thread_id=backboard_thread_id,
-                content=verification_message,
-                files=[temp_screenshot_path],
-                llm_provider=llm_provider,
-                model_name=model_name,
-                memory="off",
-                stream=False
-            )
-            
-            try:
-                os.unlink(temp_screenshot_path)
-            except:
-                pass
+                await backboard_client.add_message(
+                    thread_id=backboard_thread_id,
+                    content=verification_message,
+                    files=[final_screenshot.path()],
+                    llm_provider=llm_provider,
+                    model_name=model_name,
+                    memory="off",
+                    stream=False
+                )
         except Exception as e:
             print(f"Warning: Failed to send final verification screenshot: {e}")
     
-    tag_match = re.search(r'<voice>(.*?)</voice>', full_response, re.DOTALL)
-    assistant_response = tag_match.group(1).strip() if tag_match else full_response
-    assistant_response = re.sub(r'<[^>]+>', '', assistant_response).strip()
     analysis_data = {
         "model": f"{llm_provider}/{model_name}",
         "complexity": classification['complexity'],
@@ -596,54 +719,79 @@ async def ask_backboard(user_message: str, screenshot_b64: str, ocr_text: str, t
     }
     
     return assistant_response, full_response, thread_id, analysis_data
-@app.post("/command", response_model=CommandResponse)
-async def run_command(request: CommandRequest):
-    """Main command endpoint.
+async def process_command(request: CommandRequest, on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+    """Run one command end to end, optionally reporting progress as it happens.
+
+    Captures a screenshot and runs OCR while the task complexity is
+    classified concurrently, sends the command to the AI agent, executes
+    tool calls, and takes an updated screenshot. Shared by ``/command``,
+    ``/command/stream`` and ``/ws``.
 
-    Captures a screenshot, runs OCR, sends the command to the AI agent,
-    executes tool calls, and returns the result along with an updated screenshot.
+    Commands run one at a time, in arrival order: tool calls click against
+    the OCR index and coordinate map stored on ``tool_executor``, which the
+    next command would overwrite. A command that has to wait reports a
+    ``queued`` status first.
 
     Args:
         request: CommandRequest containing the user's text and optional thread_id.
+        on_event: Optional coroutine called with (event, data) for progress events.
 
     Returns:
-        CommandResponse with the assistant message, screenshot, and analysis data.
+        Dict with 'assistant_message', 'thread_id', 'success', 'analysis'
+        (or None) and 'screenshot' (the latest EncodedFrame).
     """
+    lock = command_lock()
+    if lock.locked():
+        await _emit(on_event, "status", {"stage": "queued"})
+    async with lock:
+        return await _run_command(request, on_event)
+
+async def _run_command(request: CommandRequest, on_event: Optional[EventCallback]) -> Dict[str, Any]:
+    """Body of ``process_command``, run while holding the command lock."""
     print("\n" + "=" * 60)
     print(f"USER SAID: {request.text}")
     print(f"THREAD ID: {request.thread_id or 'NEW'}")
     print("=" * 60 + "\n")
     
-    print("Capturing screenshot and running OCR...")
-    screenshot_b64, ocr_text, scale_factor = get_screenshot_with_ocr()
-    print(f"OCR detected {len(ocr_text.split(chr(10)))} text elements")
-    print(f"Scale factor: {scale_factor:.2f}x (resized -> actual screen)")
-    print(f"\nOCR Text Preview (first 500 chars):\n{ocr_text[:500]}\n")
+    started = time.perf_counter()
+    await _emit(on_event, "status", {"stage": "capturing"})
+    print("Capturing screenshot and running OCR (classifying task in parallel)...")
+    # Classification only needs the text, so its LLM round trip overlaps capture + OCR
+    (screenshot, ocr_index, coord_map), classification = await asyncio.gather(
+        get_screenshot_with_ocr_async(),
+        classify_command(request.text),
+    )
+    print(f"OCR detected {len(ocr_index)} text elements")
+    print(f"Coordinate map: {coord_map} (screenshot -> screen)")
+    print(f"\nOCR Text Preview (first 500 chars):\n{ocr_index.text[:500]}\n")
     
     try:
         assistant_response, full_response, thread_id, analysis_data = await ask_backboard(
             request.text,
-            screenshot_b64,
-            ocr_text,
+            screenshot,
+            ocr_index,
             request.thread_id,
-            scale_factor
+            coord_map,
+            classification,
+            on_event
         )
         
         print(f"ASSISTANT SAYS: \"{assistant_response}\"")
         
-        time.sleep(1.3)
+        await tool_executor.settler.wait_async(label="final screenshot")
         
-        new_screenshot_b64, _, _ = get_screenshot_with_ocr()
+        new_screenshot, _, _ = await get_screenshot_with_ocr_async()
         
         print(f"Request completed. Thread: {thread_id}\n")
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, outcome="success")
         
-        return CommandResponse(
-            assistant_message=assistant_response,
-            screenshot_base64=new_screenshot_b64,
-            thread_id=str(thread_id),
-            success=True,
-            analysis=AnalysisData(**analysis_data)
-        )
+        return {
+            "assistant_message": assistant_response,
+            "thread_id": str(thread_id),
+            "success": True,
+            "analysis": analysis_data,
+            "screenshot": new_screenshot,
+        }
         
     except Exception as e:
         error_msg = "Sorry, something went wrong on my end"
@@ -656,13 +804,201 @@ async def run_command(request: CommandRequest):
         if os.getenv("DEBUG"):
             import traceback
             traceback.print_exc()
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, outcome="error")
         
-        return CommandResponse(
-            assistant_message=error_msg,
-            screenshot_base64=screenshot_b64,
-            thread_id=str(request.thread_id) if request.thread_id else "",
-            success=False
-        )
+        return {
+            "assistant_message": error_msg,
+            "thread_id": str(request.thread_id) if request.thread_id else "",
+            "success": False,
+            "analysis": None,
+            "screenshot": screenshot,
+        }
+
+@app.post("/command", response_model=CommandResponse)
+async def run_command(request: CommandRequest):
+    """Main command endpoint.
+
+    Runs the command to completion and returns the result along with an
+    updated screenshot (base64) in a single response.
+
+    Args:
+        request: CommandRequest containing the user's text and optional thread_id.
+
+    Returns:
+        CommandResponse with the assistant message, screenshot, and analysis data.
+    """
+    result = await process_command(request)
+    screenshot = result.pop("screenshot")
+    return CommandResponse(screenshot_base64=screenshot.base64, **result)
+
+# ============= SSE ENDPOINT =============
+@app.post("/command/stream")
+async def run_command_stream(request: CommandRequest, authenticated: bool = Depends(verify_password)):
+    """Streaming variant of ``/command`` using server-sent events.
+
+    Emits ``status``, ``classification``, ``tool_call``, ``tool_result`` and
+    ``assistant`` events as the command progresses, then a final ``done``
+    event with the same fields as CommandResponse except that the screenshot
+    is referenced by ``screenshot_url`` instead of inlined as base64. The
+    command keeps running if the client disconnects.
+
+    Args:
+        request: CommandRequest containing the user's text and optional thread_id.
+
+    Returns:
+        A ``text/event-stream`` response.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def on_event(event: str, data: Dict[str, Any]):
+        await queue.put((event, data))
+    
+    async def run():
+        try:
+            result = await process_command(request, on_event)
+            frame_id = store_screenshot(result.pop("screenshot"))
+            result["screenshot_url"] = f"/screenshot/{frame_id}"
+            await queue.put(("done", result))
+        except Exception as e:
+            await queue.put(("error", {"error": str(e)}))
+        finally:
+            await queue.put(None)
+    
+    command_task = asyncio.create_task(run())
+    
+    async def events():
+        yield ": connected\n\n"
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            event, data = item
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        await command_task
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/screenshot/{frame_id}")
+async def get_screenshot(frame_id: str, authenticated: bool = Depends(verify_password)):
+    """Serve a recent command screenshot referenced by a streamed ``done`` event."""
+    frame = screenshot_store.get(frame_id)
+    if frame is None:
+        raise HTTPException(status_code=404, detail="Screenshot expired")
+    return Response(content=frame.data, media_type=frame.mime_type, headers={"Cache-Control": "private, max-age=300"})
+
+# ============= WEBSOCKET ENDPOINT =============
+WS_AUTH_TIMEOUT = 10.0
+
+async def _receive_text(websocket: WebSocket) -> Optional[str]:
+    """Next frame's text, or None for a binary frame; raises WebSocketDisconnect on close.
+
+    ``WebSocket.receive_text``/``receive_json`` raise KeyError on binary
+    frames, which would drop the connection with a server-side traceback.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    return message.get("text")
+
+@app.websocket("/ws")
+async def command_socket(websocket: WebSocket):
+    """Long-lived command channel for the web UI.
+
+    Saves the per-command TLS/tunnel setup, Basic auth headers and base64
+    screenshot payload of ``/command``. Protocol (JSON text messages unless
+    noted):
+
+    - Client first sends ``{"type": "auth", "password": ...}``; the server
+      answers ``{"type": "ready"}`` or closes with code 1008.
+    - ``{"type": "command", "id": ..., "text": ..., "thread_id": ...}`` runs
+      a command. Progress arrives as ``{"type": "event", "id", "event",
+      "data"}`` (the same events as ``/command/stream``), then a
+      ``{"type": "screenshot", "id", "mime_type", "size"}`` header followed by
+      one binary frame with the encoded screenshot, then ``{"type": "done",
+      "id", ...CommandResponse fields without the screenshot}``.
+    - ``{"type": "ping"}`` is answered with ``{"type": "pong"}``.
+
+    A client may send a command before the previous one finished, but
+    ``process_command`` runs commands one at a time, so later ones wait (and
+    report a ``queued`` status). Replies carry the command ``id``.
+    """
+    await websocket.accept()
+    try:
+        hello = json.loads(await asyncio.wait_for(_receive_text(websocket), timeout=WS_AUTH_TIMEOUT) or "null")
+        password = str(hello.get("password", "")) if isinstance(hello, dict) else ""
+        if hello.get("type") != "auth" or not secrets.compare_digest(password, SESSION_PASSWORD):
+            await websocket.close(code=1008, reason="Invalid password")
+            return
+    except (asyncio.TimeoutError, ValueError, AttributeError):
+        # Also covers a binary or non-JSON first frame
+        await websocket.close(code=1008, reason="Authentication required")
+        return
+    except WebSocketDisconnect:
+        return
+    
+    send_lock = asyncio.Lock()
+    tasks = set()
+    
+    async def send_json(message: Dict[str, Any]):
+        async with send_lock:
+            await websocket.send_text(json.dumps(message, default=str))
+    
+    async def run(command_id: Any, request: CommandRequest):
+        async def on_event(event: str, data: Dict[str, Any]):
+            await send_json({"type": "event", "id": command_id, "event": event, "data": data})
+        
+        try:
+            result = await process_command(request, on_event)
+            screenshot = result.pop("screenshot")
+            async with send_lock:
+                await websocket.send_text(json.dumps({
+                    "type": "screenshot",
+                    "id": command_id,
+                    "mime_type": screenshot.mime_type,
+                    "size": len(screenshot),
+                }))
+                await websocket.send_bytes(screenshot.data)
+            await send_json({"type": "done", "id": command_id, **result})
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            try:
+                await send_json({"type": "error", "id": command_id, "error": str(e)})
+            except Exception:
+                pass
+    
+    await websocket.send_json({"type": "ready"})
+    try:
+        while True:
+            text = await _receive_text(websocket)
+            if text is None:
+                print("[WARNING] /ws: ignoring binary frame from client")
+                await send_json({"type": "error", "id": None, "error": "Binary frames are not accepted; send JSON text"})
+                continue
+            try:
+                message = json.loads(text)
+            except ValueError:
+                await send_json({"type": "error", "id": None, "error": "Messages must be JSON"})
+                continue
+            if not isinstance(message, dict):
+                message = {}
+            kind = message.get("type")
+            if kind == "ping":
+                await send_json({"type": "pong"})
+            elif kind == "command":
+                request = CommandRequest(text=str(message.get("text", "")), thread_id=message.get("thread_id"))
+                task = asyncio.create_task(run(message.get("id"), request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            else:
+                await send_json({"type": "error", "id": message.get("id"), "error": f"Unknown message type: {kind}"})
+    except WebSocketDisconnect:
+        # Commands already started or queued keep running; their results are simply not delivered
+        pass
 
 # ============= STARTUP MESSAGE =============
 @app.on_event("startup")
@@ -689,14 +1025,23 @@ async def startup_event():
             backboard_client = BackboardClient(api_key=backboard_api_key)
             print("[OK] Backboard client initialized")
             
+            plugin_tools = tool_registry.load_plugins(plugin_dir())
+            if plugin_tools:
+                print(f"[OK] Loaded plugin tools from {plugin_dir()}: {', '.join(plugin_tools)}")
+            
             assistant = await backboard_client.create_assistant(
                 name="Remoto AI",
                 description=SYSTEM_PROMPT,
-                tools=TOOL_DEFINITIONS
+                tools=tool_registry.definitions()
             )
             print(f"[OK] Assistant created: {assistant.assistant_id}")
             
-            tool_executor.set_backboard_client(backboard_client, assistant.assistant_id)
+            tool_executor.set_backboard_client(backboard_client, assistant.assistant_id, vision_threads)
+            
+            await asyncio.gather(
+                classifier_threads.warm(backboard_client, assistant.assistant_id),
+                vision_threads.warm(backboard_client, assistant.assistant_id),
+            )
             
             shortcuts_path = "server/shortcuts.json"
             if os.path.exists(shortcuts_path):
@@ -716,6 +1061,17 @@ async def startup_event():
             print(f"[ERROR] Backboard initialization failed: {e}")
             print("The app will not work without Backboard integration")
     
+    try:
+        print(f"[OK] OCR engine: {ocr.get_engine().name}")
+    except Exception as e:
+        print(f"[WARNING] OCR engine failed to initialize: {e}")
+    
+    if os.getenv("REMOTO_CAPTURE_DAEMON", "1") != "0":
+        try:
+            capture_daemon.start()
+        except Exception as e:
+            print(f"[WARNING] Capture daemon unavailable, using direct screenshots: {e}")
+    
     print("=" * 60)
     print("REMOTO AI BACKEND READY")
     print("=" * 60)
@@ -724,5 +1080,14 @@ async def startup_event():
     print(f"Stream URL: {os.getenv('STREAM_URL', 'Not set yet')}")
     print("=" * 60 + "\n")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the capture daemon, OCR workers and stage executors, release shared memory and delete pooled threads."""
+    await asyncio.gather(classifier_threads.close(), vision_threads.close(), return_exceptions=True)
+    executors.shutdown()
+    capture_daemon.stop()
+    if hasattr(ocr_engine, "close"):
+        ocr_engine.close()
+
 if __name__ == "__main__":    
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,170 @@
+"""
+Prometheus metrics for the command pipeline, without external dependencies.
+
+``/stats`` reports cumulative counters as JSON. ``/metrics`` serves the same
+kind of signal in the Prometheus text format, so any scraper or
+``curl | grep`` can see where a command's time goes. The collectors here are
+deliberately small: a counter or histogram observation is one dict lookup
+and a bisect under a lock, cheap enough to stay on in production. Nothing is
+pushed anywhere.
+
+The pipeline's metrics are defined once at the bottom of this module and
+imported where they are recorded.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) shared by every latency histogram
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, one series per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_format_labels(self.labelnames, key)} {value:g}"
+                                 for key, value in values]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets, one series per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [non-cumulative count per bucket (+Inf last), sum]
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = self._header()
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, key, 'le="' + bound + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total:.6f}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collects metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Exposition text for every registered metric."""
+        lines: List[str] = []
+        for metric in self.metrics.values():
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# ---- Command pipeline ----
+REQUEST_SECONDS = REGISTRY.histogram(
+    "remoto_request_seconds", "Total time to handle one command", ["outcome"])
+STAGE_SECONDS = REGISTRY.histogram(
+    "remoto_stage_seconds",
+    "Time spent per pipeline stage (capture, ocr, encode, classification, llm_turn, verification)",
+    ["stage"])
+TOOL_SECONDS = REGISTRY.histogram(
+    "remoto_tool_seconds", "Time to run one tool call, including validation", ["tool"])
+TOOL_CALLS = REGISTRY.counter(
+    "remoto_tool_calls_total", "Tool calls by outcome", ["tool", "outcome"])
+OCR_CACHE = REGISTRY.counter(
+    "remoto_ocr_cache_total", "Screenshot/OCR cache lookups", ["result"])
+VISION_FALLBACKS = REGISTRY.counter(
+    "remoto_vision_fallbacks_total", "find_and_click searches that fell back to the vision model", ["outcome"])
+CLASSIFICATIONS = REGISTRY.counter(
+    "remoto_classifications_total", "Task classifications by complexity and source", ["complexity", "source"])
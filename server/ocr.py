@@ -0,0 +1,474 @@
+"""
+OCR stage of the screenshot pipeline.
+
+Wraps Tesseract and turns its word-level output into word records with
+bounding boxes. Recognition goes through a warm in-process Tesseract handle
+(tesserocr) when that binding is installed and falls back to pytesseract,
+which spawns the ``tesseract`` binary per call, otherwise. Besides a plain full-frame pass, this module
+provides an incremental mode that only re-OCRs the parts of the frame that
+changed since the previous call and reuses the cached words everywhere else,
+a banded mode that spreads one frame over a process pool, and a small LRU/TTL
+cache that skips OCR entirely for a frame already seen.
+"""
+
+import hashlib
+import multiprocessing as mp
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# Minimum Tesseract confidence for a word to be shown to the LLM
+MIN_CONFIDENCE = 30
+
+Word = Dict[str, Any]
+Rect = Tuple[int, int, int, int]  # (left, top, right, bottom), right/bottom exclusive
+
+_TSV_COLUMNS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+                "left", "top", "width", "height", "conf", "text")
+_WORD_LEVEL = "5"
+
+
+class PytesseractEngine:
+    """Per-call engine: pytesseract forks the tesseract binary for every image."""
+
+    name = "pytesseract"
+
+    def image_to_data(self, image: np.ndarray) -> Dict[str, list]:
+        return pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+
+
+class TesserocrEngine:
+    """Warm in-process Tesseract engine backed by tesserocr.
+
+    Keeps one ``PyTessBaseAPI`` handle per thread for the life of the
+    process, so the language model is loaded once instead of on every frame
+    and images are handed over as raw pixel buffers instead of temp files.
+    Results are returned in pytesseract's ``image_to_data`` dict layout.
+
+    Args:
+        lang: Tesseract language code.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str = "eng"):
+        self.lang = lang
+        self._local = threading.local()
+        self._get_api()  # fail fast if the model can't be loaded
+
+    def _get_api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+        return api
+
+    def image_to_data(self, image: np.ndarray) -> Dict[str, list]:
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        api = self._get_api()
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+        tsv = api.GetTSVText(0)
+
+        data = {column: [] for column in _TSV_COLUMNS}
+        for line in tsv.splitlines():
+            fields = line.split("\t")
+            if len(fields) < len(_TSV_COLUMNS) or fields[0] != _WORD_LEVEL:
+                continue
+            for column, value in zip(_TSV_COLUMNS[:-1], fields):
+                data[column].append(float(value) if column == "conf" else int(value))
+            data["text"].append("\t".join(fields[len(_TSV_COLUMNS) - 1:]))
+        return data
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return this process's OCR engine, creating it on first use.
+
+    REMOTO_OCR_ENGINE selects 'tesserocr', 'pytesseract' or 'auto' (default),
+    which prefers the warm tesserocr engine and falls back to pytesseract if
+    the binding is missing or fails to initialise.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            choice = os.getenv("REMOTO_OCR_ENGINE", "auto").lower()
+            if choice != "pytesseract" and tesserocr is not None:
+                try:
+                    _engine = TesserocrEngine(lang=os.getenv("REMOTO_OCR_LANG", "eng"))
+                except Exception as e:
+                    print(f"[WARNING] tesserocr unavailable, falling back to pytesseract: {e}")
+            elif choice == "tesserocr":
+                print("[WARNING] REMOTO_OCR_ENGINE=tesserocr but tesserocr is not installed; using pytesseract")
+            if _engine is None:
+                _engine = PytesseractEngine()
+        return _engine
+
+
+def run_ocr(image: np.ndarray, offset: Tuple[int, int] = (0, 0)) -> List[Word]:
+    """Run Tesseract on an image and return its non-empty words.
+
+    Args:
+        image: Image array (grayscale or BGR) to recognise.
+        offset: (x, y) added to every box, used when ``image`` is a crop.
+
+    Returns:
+        List of word dicts with 'text', 'left', 'top', 'width', 'height',
+        'conf', 'block_num', 'par_num', 'line_num' and 'word_num'.
+    """
+    data = get_engine().image_to_data(image)
+    dx, dy = offset
+    words = []
+    for i in range(len(data['text'])):
+        text = str(data['text'][i]).strip()
+        if not text:
+            continue
+        words.append({
+            "text": text,
+            "left": int(data['left'][i]) + dx,
+            "top": int(data['top'][i]) + dy,
+            "width": int(data['width'][i]),
+            "height": int(data['height'][i]),
+            "conf": float(data['conf'][i]),
+            "block_num": int(data['block_num'][i]),
+            "par_num": int(data['par_num'][i]),
+            "line_num": int(data['line_num'][i]),
+            "word_num": int(data['word_num'][i]),
+        })
+    return words
+
+
+def _word_rect(word: Word) -> Rect:
+    return (word["left"], word["top"], word["left"] + word["width"], word["top"] + word["height"])
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(a: Rect, b: Rect) -> Rect:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+class IncrementalOcr:
+    """Re-OCR only the tiles of a frame that changed since the last call.
+
+    The frame is split into a grid of tiles and each tile is hashed. Dirty
+    tiles are grouped into connected regions; cached words touching a dirty
+    region are dropped, the region (grown to cover those words) is OCR'd on
+    its own, and the fresh words are merged with the cached words from the
+    untouched part of the screen. When too much of the frame changed, or the
+    frame size differs from the previous one, a full pass is run instead.
+
+    Args:
+        tile_size: (width, height) of a tile in pixels.
+        max_dirty_ratio: Fraction of dirty tiles above which a full pass is cheaper.
+        margin: Pixels of context added around each dirty region before OCR.
+    """
+
+    def __init__(self, tile_size: Tuple[int, int] = (160, 90), max_dirty_ratio: float = 0.5, margin: int = 8):
+        self.tile_w, self.tile_h = tile_size
+        self.max_dirty_ratio = max_dirty_ratio
+        self.margin = margin
+        self.words: List[Word] = []
+        self.tile_hashes: Optional[np.ndarray] = None
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.full_passes = 0
+        self.partial_passes = 0
+        self._lock = threading.Lock()
+
+    def _hash_tiles(self, image: np.ndarray) -> np.ndarray:
+        rows = -(-image.shape[0] // self.tile_h)
+        cols = -(-image.shape[1] // self.tile_w)
+        hashes = np.empty((rows, cols), dtype=np.uint64)
+        for r in range(rows):
+            band = image[r * self.tile_h:(r + 1) * self.tile_h]
+            for c in range(cols):
+                tile = np.ascontiguousarray(band[:, c * self.tile_w:(c + 1) * self.tile_w])
+                digest = hashlib.blake2b(tile.data, digest_size=8).digest()
+                hashes[r, c] = int.from_bytes(digest, "little")
+        return hashes
+
+    def _dirty_regions(self, dirty: np.ndarray, height: int, width: int) -> List[Rect]:
+        """Group dirty tiles into 4-connected components and return their pixel bounds."""
+        seen = np.zeros_like(dirty)
+        regions = []
+        rows, cols = dirty.shape
+        for r0 in range(rows):
+            for c0 in range(cols):
+                if not dirty[r0, c0] or seen[r0, c0]:
+                    continue
+                stack = [(r0, c0)]
+                seen[r0, c0] = True
+                rmin, rmax, cmin, cmax = r0, r0, c0, c0
+                while stack:
+                    r, c = stack.pop()
+                    rmin, rmax, cmin, cmax = min(rmin, r), max(rmax, r), min(cmin, c), max(cmax, c)
+                    for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                        if 0 <= nr < rows and 0 <= nc < cols and dirty[nr, nc] and not seen[nr, nc]:
+                            seen[nr, nc] = True
+                            stack.append((nr, nc))
+                regions.append((
+                    cmin * self.tile_w,
+                    rmin * self.tile_h,
+                    min((cmax + 1) * self.tile_w, width),
+                    min((rmax + 1) * self.tile_h, height),
+                ))
+        return regions
+
+    def _full_pass(self, image: np.ndarray, hashes: np.ndarray) -> List[Word]:
+        self.words = run_ocr(image)
+        self.tile_hashes = hashes
+        self.shape = image.shape
+        self.full_passes += 1
+        return list(self.words)
+
+    def __call__(self, image: np.ndarray) -> List[Word]:
+        """OCR a frame, reusing cached words for unchanged tiles.
+
+        Args:
+            image: The OCR input frame (same preprocessing every call).
+
+        Returns:
+            Words for the whole frame, in the same format as ``run_ocr``.
+        """
+        with self._lock:
+            hashes = self._hash_tiles(image)
+            if self.tile_hashes is None or self.shape != image.shape:
+                return self._full_pass(image, hashes)
+
+            dirty = hashes != self.tile_hashes
+            if not dirty.any():
+                return list(self.words)
+            if dirty.mean() > self.max_dirty_ratio:
+                return self._full_pass(image, hashes)
+
+            height, width = image.shape[:2]
+            words = self.words
+            next_block = max((w["block_num"] for w in words), default=0) + 1
+            for region in self._dirty_regions(dirty, height, width):
+                stale = [w for w in words if _intersects(_word_rect(w), region)]
+                kept = [w for w in words if not _intersects(_word_rect(w), region)]
+
+                crop = region
+                for word in stale:
+                    crop = _union(crop, _word_rect(word))
+                left = max(crop[0] - self.margin, 0)
+                top = max(crop[1] - self.margin, 0)
+                right = min(crop[2] + self.margin, width)
+                bottom = min(crop[3] + self.margin, height)
+
+                fresh = run_ocr(image[top:bottom, left:right], offset=(left, top))
+                # Words cut at the crop edge that still belong to a cached word are dropped
+                kept_rects = [_word_rect(w) for w in kept if _intersects(_word_rect(w), (left, top, right, bottom))]
+                for word in fresh:
+                    if any(_intersects(_word_rect(word), rect) for rect in kept_rects):
+                        continue
+                    # Keep line grouping unique across separately OCR'd regions
+                    word["block_num"] += next_block
+                    kept.append(word)
+                next_block = max((w["block_num"] for w in kept), default=0) + 1
+                words = kept
+
+            self.words = words
+            self.tile_hashes = hashes
+            self.partial_passes += 1
+            return list(words)
+
+
+def _init_band_worker(tesseract_cmd: str):
+    """Prepare a band worker process.
+
+    Pins Tesseract to one thread per worker so bands don't oversubscribe the
+    CPU, carries over the tesseract path configured in the parent, and warms
+    the OCR engine before the first band arrives.
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    get_engine()
+
+
+class BandedOcr:
+    """OCR a frame as overlapping horizontal bands in a process pool.
+
+    Tesseract is single-threaded per invocation, so one frame is cut into
+    ``bands`` horizontal strips that are recognised in parallel. Each strip
+    owns a core range of rows and is padded by ``overlap`` pixels on both
+    sides so words on a boundary are seen whole by at least one band; a word
+    is kept only by the band whose core range contains its center, which
+    removes the duplicates read in the overlaps.
+
+    Args:
+        bands: Number of horizontal strips per frame.
+        workers: Process pool size (defaults to ``bands`` capped at the CPU count).
+        overlap: Rows of padding shared between neighbouring bands.
+    """
+
+    def __init__(self, bands: int = 4, workers: Optional[int] = None, overlap: int = 32):
+        self.bands = max(1, bands)
+        self.workers = workers or min(self.bands, os.cpu_count() or 1)
+        self.overlap = overlap
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=mp.get_context("spawn"),
+                    initializer=_init_band_worker,
+                    initargs=(pytesseract.pytesseract.tesseract_cmd,),
+                )
+            return self.pool
+
+    def __call__(self, image: np.ndarray) -> List[Word]:
+        """OCR a frame band by band and merge the results.
+
+        Args:
+            image: The OCR input frame.
+
+        Returns:
+            Words for the whole frame, in the same format as ``run_ocr``.
+        """
+        height = image.shape[0]
+        band_height = -(-height // self.bands)
+        pool = self._get_pool()
+
+        jobs = []
+        for i in range(self.bands):
+            core_top = i * band_height
+            core_bottom = min(core_top + band_height, height)
+            if core_top >= core_bottom:
+                break
+            top = max(core_top - self.overlap, 0)
+            bottom = min(core_bottom + self.overlap, height)
+            future = pool.submit(run_ocr, np.ascontiguousarray(image[top:bottom]), (0, top))
+            jobs.append((core_top, core_bottom, future))
+
+        words = []
+        block_offset = 0
+        for core_top, core_bottom, future in jobs:
+            band_words = future.result()
+            band_blocks = max((w["block_num"] for w in band_words), default=0)
+            for word in band_words:
+                center_y = word["top"] + word["height"] // 2
+                if core_top <= center_y < core_bottom:
+                    # Keep line grouping unique across bands
+                    word["block_num"] += block_offset
+                    words.append(word)
+            block_offset += band_blocks
+        return words
+
+    def close(self):
+        """Shut down the worker pool."""
+        with self._lock:
+            if self.pool is not None:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = None
+
+
+class OcrCache:
+    """LRU cache with TTL for finished screenshot/OCR results.
+
+    Entries are keyed by a perceptual hash of the resized frame: a 320x180
+    grayscale thumbnail quantized to 64 levels. That ignores encoder noise and
+    sub-pixel jitter but still changes when text on screen changes, so an
+    unchanged screen returns the previous result without running Tesseract.
+
+    Args:
+        max_entries: Number of frames kept before the least recently used is evicted.
+        ttl: Seconds an entry stays valid; 0 disables the cache.
+    """
+
+    def __init__(self, max_entries: int = 16, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def frame_hash(image: np.ndarray) -> bytes:
+        """Perceptual hash of a grayscale (or RGB) frame."""
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        thumb = cv2.resize(gray, (320, 180), interpolation=cv2.INTER_AREA) >> 2
+        return hashlib.blake2b(thumb.tobytes(), digest_size=16).digest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value for ``key`` or None, updating hit/miss counters."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self.entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, value: Any):
+        """Store a result, evicting the least recently used entry when full."""
+        with self._lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the /stats endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def cache_from_env() -> OcrCache:
+    """Build the OCR result cache from REMOTO_OCR_CACHE_SIZE and REMOTO_OCR_CACHE_TTL."""
+    return OcrCache(
+        max_entries=int(os.getenv("REMOTO_OCR_CACHE_SIZE", "16")),
+        ttl=float(os.getenv("REMOTO_OCR_CACHE_TTL", "30")),
+    )
+
+
+def from_env():
+    """Return the OCR callable selected by REMOTO_OCR_MODE ('full', 'incremental' or 'banded')."""
+    mode = os.getenv("REMOTO_OCR_MODE", "full").lower()
+    if mode == "incremental":
+        return IncrementalOcr(max_dirty_ratio=float(os.getenv("REMOTO_OCR_MAX_DIRTY", "0.5")))
+    if mode == "banded":
+        workers = os.getenv("REMOTO_OCR_WORKERS")
+        return BandedOcr(
+            bands=int(os.getenv("REMOTO_OCR_BANDS", "4")),
+            workers=int(workers) if workers else None,
+        )
+    return run_ocr
@@ -0,0 +1,226 @@
+"""
+Array-backed index over the OCR words of one frame.
+
+``OcrIndex`` replaces the newline-joined OCR string that used to be handed to
+``ToolExecutor``. Word boxes, sizes and confidences live in numpy arrays and
+the words themselves in an interned vocabulary table, so element lookups are
+vectorized instead of re-splitting and regex-parsing text. The LLM-facing
+'"text" at (x, y)' string is rendered from the index on first use.
+
+Words are also grouped into lines using Tesseract's block/paragraph/line
+numbers, which lets ``search`` match multi-word targets such as "Sign in"
+and tolerate small OCR typos through edit-distance and trigram similarity.
+"""
+
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from server.ocr import MIN_CONFIDENCE, Word
+
+# Minimum similarity (0-1) for a fuzzy phrase match to count
+FUZZY_THRESHOLD = 0.8
+
+# Score given to a query found inside a longer word (e.g. "send" in "Sender")
+SUBSTRING_SCORE = 0.9
+
+# Penalty for matching only once spaces are removed ("Signin" for "Sign in")
+COMPACT_PENALTY = 0.98
+
+# Character sequences Tesseract commonly confuses, folded before fuzzy comparison
+_OCR_CONFUSIONS = (("rn", "m"), ("vv", "w"), ("0", "o"), ("1", "l"), ("|", "l"), ("5", "s"))
+
+
+def _fold(text: str) -> str:
+    for seen, meant in _OCR_CONFUSIONS:
+        text = text.replace(seen, meant)
+    return text
+
+
+def _levenshtein(a: str, b: str) -> int:
+    """Edit distance between two strings (insertions, deletions, substitutions)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Similarity in [0, 1]: the better of normalized edit distance and trigram overlap.
+
+    Common OCR confusions (e.g. 'rn' read for 'm') are folded on both sides first.
+    """
+    if a == b:
+        return 1.0
+    a, b = _fold(a), _fold(b)
+    if a == b:
+        return 0.95
+    if not a or not b:
+        return 0.0
+    edit = 1.0 - _levenshtein(a, b) / max(len(a), len(b))
+    ta, tb = _trigrams(a), _trigrams(b)
+    trigram = len(ta & tb) / len(ta | tb)
+    return max(edit, trigram)
+
+
+class OcrIndex:
+    """OCR words of one frame, stored column-wise.
+
+    Only words above ``MIN_CONFIDENCE`` are indexed, matching what the LLM is
+    shown, so coordinates it reads from the prompt resolve to the same boxes.
+
+    Attributes:
+        vocab: Interned table of distinct word strings.
+        word_ids: Index into ``vocab`` for each word, shape (N,).
+        centers: Box centers (x, y) in OCR space, shape (N, 2).
+        sizes: Box sizes (width, height), shape (N, 2).
+        boxes: Box bounds (left, top, right, bottom), shape (N, 4).
+        conf: Tesseract confidences, shape (N,).
+        line_ids: Line each word belongs to, shape (N,).
+    """
+
+    def __init__(self, words: List[Word]):
+        words = [w for w in words if w["conf"] > MIN_CONFIDENCE]
+        n = len(words)
+
+        table: Dict[str, int] = {}
+        lines: Dict[Tuple[int, int, int], int] = {}
+        self.vocab: List[str] = []
+        self.word_ids = np.empty(n, dtype=np.int32)
+        self.centers = np.empty((n, 2), dtype=np.int32)
+        self.sizes = np.empty((n, 2), dtype=np.int32)
+        self.boxes = np.empty((n, 4), dtype=np.int32)
+        self.conf = np.empty(n, dtype=np.float32)
+        self.line_ids = np.empty(n, dtype=np.int32)
+
+        for i, word in enumerate(words):
+            text = word["text"]
+            word_id = table.get(text)
+            if word_id is None:
+                word_id = table[text] = len(self.vocab)
+                self.vocab.append(sys.intern(text))
+            line_key = (word.get("block_num", 0), word.get("par_num", 0), word.get("line_num", 0))
+            self.word_ids[i] = word_id
+            self.centers[i] = (word["left"] + word["width"] // 2, word["top"] + word["height"] // 2)
+            self.sizes[i] = (word["width"], word["height"])
+            self.boxes[i] = (word["left"], word["top"], word["left"] + word["width"], word["top"] + word["height"])
+            self.conf[i] = word["conf"]
+            self.line_ids[i] = lines.setdefault(line_key, len(lines))
+
+        self.vocab_lower = [w.lower() for w in self.vocab]
+        self._text: Optional[str] = None
+        self._lines: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.word_ids)
+
+    @property
+    def text(self) -> str:
+        """LLM-facing rendering, one '"text" at (x, y)' line per word."""
+        if self._text is None:
+            lines = [
+                f'"{self.vocab[word_id]}" at ({x}, {y})'
+                for word_id, (x, y) in zip(self.word_ids.tolist(), self.centers.tolist())
+            ]
+            self._text = "\n".join(lines) if lines else "No text detected"
+        return self._text
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def lines(self) -> List[np.ndarray]:
+        """Word indices of each line, ordered left to right (built on first use)."""
+        if self._lines is None:
+            self._lines = []
+            order = np.lexsort((self.boxes[:, 0], self.line_ids))
+            if len(order):
+                breaks = np.flatnonzero(np.diff(self.line_ids[order])) + 1
+                self._lines = np.split(order, breaks)
+        return self._lines
+
+    def _candidate(self, indices: np.ndarray, score: float) -> Dict[str, Any]:
+        box = self.boxes[indices]
+        left, top = box[:, 0].min(), box[:, 1].min()
+        right, bottom = box[:, 2].max(), box[:, 3].max()
+        return {
+            "text": " ".join(self.vocab[i] for i in self.word_ids[indices].tolist()),
+            "center": (int(left + right) // 2, int(top + bottom) // 2),
+            "size": (int(right - left), int(bottom - top)),
+            "conf": float(self.conf[indices].mean()),
+            "score": score,
+        }
+
+    def search(self, query: str, limit: int = 5, threshold: float = FUZZY_THRESHOLD) -> List[Dict[str, Any]]:
+        """Rank words and phrases on screen against ``query``.
+
+        Single words are matched with a vectorized exact/substring scan over
+        the vocabulary. Phrases are contiguous runs of words on one line,
+        with one word more or fewer than the query to absorb words Tesseract
+        split or merged; they are compared case-insensitively, with and
+        without spaces, by edit distance and trigram similarity after
+        folding common OCR confusions.
+
+        Args:
+            query: Element text to find.
+            limit: Maximum number of candidates returned.
+            threshold: Minimum fuzzy similarity for a phrase to qualify.
+
+        Returns:
+            Candidates sorted best first, each with 'text', 'center', 'size',
+            'conf' and 'score'. Ties on score prefer higher confidence, then
+            larger boxes.
+        """
+        q = " ".join(query.lower().split())
+        if not len(self) or not q:
+            return []
+
+        candidates = []
+
+        # Single-word matches straight off the vocabulary table
+        exact = np.fromiter((w == q for w in self.vocab_lower), dtype=bool, count=len(self.vocab))
+        inside = np.fromiter((q in w for w in self.vocab_lower), dtype=bool, count=len(self.vocab))
+        for vocab_mask, score in ((exact, 1.0), (inside & ~exact, SUBSTRING_SCORE)):
+            for i in np.flatnonzero(vocab_mask[self.word_ids]):
+                candidates.append(self._candidate(np.array([i]), score))
+
+        # Phrase and fuzzy matches over runs of words within a line
+        q_tokens = len(q.split())
+        q_compact = q.replace(" ", "")
+        for line in self.lines:
+            for span in range(max(1, q_tokens - 1), min(q_tokens + 1, len(line)) + 1):
+                for start in range(len(line) - span + 1):
+                    indices = line[start:start + span]
+                    words = [self.vocab_lower[i] for i in self.word_ids[indices].tolist()]
+                    phrase = " ".join(words)
+                    if span == 1 and (phrase == q or q in phrase):
+                        continue  # already found by the vocabulary scan
+                    score = max(similarity(phrase, q), similarity("".join(words), q_compact) * COMPACT_PENALTY)
+                    if score >= threshold:
+                        candidates.append(self._candidate(indices, score))
+
+        candidates.sort(key=lambda c: (c["score"], c["conf"], c["size"][0] * c["size"][1]), reverse=True)
+        return candidates[:limit]
+
+    def find(self, query: str) -> Optional[Tuple[int, int]]:
+        """Locate the best match for ``query`` on screen.
+
+        Args:
+            query: Text to look for (single word or phrase).
+
+        Returns:
+            (x, y) center in OCR space, or None if nothing matches.
+        """
+        candidates = self.search(query, limit=1)
+        return candidates[0]["center"] if candidates else None
@@ -0,0 +1,89 @@
+"""
+OpenCV preprocessing of captured frames before OCR.
+
+Frames are resized once with area interpolation (the right filter for
+downscaling screen content) to fit within the target size with their aspect
+ratio preserved, into a preallocated RGB buffer that is also what gets
+encoded for the LLM, then converted straight to grayscale for Tesseract.
+Presets can additionally binarize or sharpen the grayscale image. All
+intermediate images live in per-thread buffers that are reused frame after
+frame, so the steady state allocates nothing.
+"""
+
+import os
+import threading
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+PRESETS = ("gray", "binary", "sharpen")
+
+
+class Preprocessor:
+    """Resize and prepare frames for OCR with reusable buffers.
+
+    Args:
+        size: Maximum (width, height) of the OCR/LLM image. Frames are fitted
+            inside it without distortion and never upscaled.
+        preset: 'gray' (grayscale only), 'binary' (Otsu threshold, dark text
+            on light background) or 'sharpen' (unsharp mask on grayscale).
+    """
+
+    def __init__(self, size: Tuple[int, int] = (1280, 720), preset: str = "gray"):
+        if preset not in PRESETS:
+            raise ValueError(f"Unknown OCR preprocessing preset: {preset} (expected one of {PRESETS})")
+        self.size = size
+        self.preset = preset
+        self._local = threading.local()
+
+    def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        buffer = getattr(self._local, name, None)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            setattr(self._local, name, buffer)
+        return buffer
+
+    def fit(self, width: int, height: int) -> Tuple[int, int]:
+        """Output (width, height) for a frame of the given size."""
+        max_width, max_height = self.size
+        scale = min(max_width / width, max_height / height, 1.0)
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def resize(self, frame: np.ndarray) -> np.ndarray:
+        """Area-resize an RGB frame into this thread's resize buffer.
+
+        The returned array is overwritten by the next call on the same thread.
+        """
+        width, height = self.fit(frame.shape[1], frame.shape[0])
+        out = self._buffer("resized", (height, width, 3))
+        cv2.resize(frame, (width, height), dst=out, interpolation=cv2.INTER_AREA)
+        return out
+
+    def gray(self, resized: np.ndarray) -> np.ndarray:
+        """Convert a resized RGB frame to grayscale (no intermediate BGR copy)."""
+        out = self._buffer("gray", resized.shape[:2])
+        cv2.cvtColor(resized, cv2.COLOR_RGB2GRAY, dst=out)
+        return out
+
+    def for_ocr(self, gray: np.ndarray) -> np.ndarray:
+        """Apply the preset to a grayscale frame and return the OCR input."""
+        if self.preset == "binary":
+            out = self._buffer("binary", gray.shape)
+            cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU, dst=out)
+            # Tesseract expects dark text on a light background; flip dark-mode screens
+            if cv2.mean(out)[0] < 127:
+                cv2.bitwise_not(out, dst=out)
+            return out
+        if self.preset == "sharpen":
+            blurred = self._buffer("blurred", gray.shape)
+            out = self._buffer("sharpened", gray.shape)
+            cv2.GaussianBlur(gray, (0, 0), 1.0, dst=blurred)
+            cv2.addWeighted(gray, 1.5, blurred, -0.5, 0, dst=out)
+            return out
+        return gray
+
+
+def from_env(size: Tuple[int, int] = (1280, 720)) -> Preprocessor:
+    """Build a Preprocessor using the REMOTO_OCR_PREPROCESS preset (default 'gray')."""
+    return Preprocessor(size=size, preset=os.getenv("REMOTO_OCR_PREPROCESS", "gray").lower())
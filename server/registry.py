@@ -0,0 +1,382 @@
+"""
+Decorator-based registry of the tools the assistant can call.
+
+Tools used to be described twice: a hand-written JSON schema in
+``TOOL_DEFINITIONS`` and an ``if/elif`` branch in ``ToolExecutor.execute``,
+which had to be kept in sync with the method signatures by hand. Handlers
+now register themselves with ``@tool``. The schema is generated from the
+signature: annotations give the JSON types, parameters without a default
+are required, and ``Literal`` gives an enum. The description strings the
+LLM sees are passed to the decorator.
+
+Arguments are checked against validators built once at registration time.
+Integral floats and numeric strings are accepted for numbers and "true" or
+"false" for booleans, since models sometimes send them. Every call is timed
+into a latency histogram with call and failure counts for /stats (and the
+``remoto_tool_*`` series on /metrics).
+
+Extra tools can live outside the repository. Every ``*.py`` file in the
+plugin directory (REMOTO_TOOL_PLUGINS, default ``~/.remoto/tools``) is
+imported at startup and can register handlers::
+
+    from server.registry import tool
+
+    @tool("Open the team dashboard", params={"tab": "Dashboard tab to show"}, runs_on="input")
+    def open_dashboard(executor, tab: str = "overview"):
+        ...
+        return {"success": True, "message": f"Opened {tab}"}
+
+Handlers receive the ``ToolExecutor`` as their first argument and return a
+result dict with at least 'success'.
+"""
+
+import importlib.util
+import inspect
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional, Union, get_args, get_origin
+
+from server import executors, metrics
+from server.metrics import LATENCY_BUCKETS
+
+RUNNERS = ("loop", "input", "screen")
+
+DEFAULT_PLUGIN_DIR = Path.home() / ".remoto" / "tools"
+
+_JSON_TYPES = {str: "string", bool: "boolean", int: "integer", float: "number", list: "array", dict: "object"}
+
+
+class ToolArgumentError(ValueError):
+    """Raised when tool-call arguments do not match the tool's parameters."""
+
+
+def _schema_for(annotation: Any) -> Dict[str, Any]:
+    """JSON schema fragment for a parameter annotation."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        members = [a for a in get_args(annotation) if a is not type(None)]
+        return _schema_for(members[0]) if len(members) == 1 else {}
+    if origin is Literal:
+        values = list(get_args(annotation))
+        return {**_schema_for(type(values[0])), "enum": values}
+    if origin in (list, List):
+        item_types = get_args(annotation)
+        schema: Dict[str, Any] = {"type": "array"}
+        if item_types and item_types[0] in _JSON_TYPES:
+            schema["items"] = {"type": _JSON_TYPES[item_types[0]]}
+        return schema
+    if origin in (dict, Dict):
+        return {"type": "object"}
+    if annotation in _JSON_TYPES:
+        return {"type": _JSON_TYPES[annotation]}
+    return {}
+
+
+def _number(value: Any, integer: bool) -> Union[int, float]:
+    if isinstance(value, bool):
+        raise ValueError("expected a number, got a boolean")
+    if isinstance(value, str):
+        value = float(value.strip())
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"expected a number, got {type(value).__name__}")
+    if integer:
+        if value != int(value):
+            raise ValueError(f"expected an integer, got {value}")
+        return int(value)
+    return value
+
+
+def _validator(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Build a function that checks (and gently coerces) one value against ``schema``."""
+    kind = schema.get("type")
+    enum = schema.get("enum")
+
+    if kind == "string":
+        def check(value):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = str(value)
+            if not isinstance(value, str):
+                raise ValueError(f"expected a string, got {type(value).__name__}")
+            return value
+    elif kind in ("integer", "number"):
+        integer = kind == "integer"
+
+        def check(value):
+            return _number(value, integer)
+    elif kind == "boolean":
+        def check(value):
+            if isinstance(value, str) and value.lower() in ("true", "false"):
+                return value.lower() == "true"
+            if not isinstance(value, bool):
+                raise ValueError(f"expected true or false, got {value!r}")
+            return value
+    elif kind == "array":
+        item_check = _validator(schema.get("items", {}))
+
+        def check(value):
+            if not isinstance(value, list):
+                raise ValueError(f"expected a list, got {type(value).__name__}")
+            return [item_check(item) for item in value]
+    elif kind == "object":
+        def check(value):
+            if not isinstance(value, dict):
+                raise ValueError(f"expected an object, got {type(value).__name__}")
+            return value
+    else:
+        def check(value):
+            return value
+
+    if enum is None:
+        return check
+
+    def check_enum(value):
+        value = check(value)
+        if value not in enum:
+            raise ValueError(f"expected one of {enum}, got {value!r}")
+        return value
+    return check_enum
+
+
+class ToolMetrics:
+    """Call count, failures and latency histogram for one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last bucket: slower than every bound
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, success: bool):
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        with self._lock:
+            self.calls += 1
+            self.failures += not success
+            self.total += seconds
+            self.buckets[index] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        labels = [f"<={bound:g}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]:g}s"]
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "failure_rate": round(self.failures / self.calls, 3) if self.calls else 0.0,
+            "total_seconds": round(self.total, 3),
+            "avg_ms": round(self.total / self.calls * 1000, 1) if self.calls else 0.0,
+            "histogram": {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class Tool:
+    """A registered tool: handler, generated schema and argument validators.
+
+    Args:
+        name: Tool name the model calls.
+        handler: Function taking the ToolExecutor followed by the tool's arguments.
+        description: Tool description shown to the model.
+        params: Per-parameter description, or a dict of schema keys that
+            override the generated ones (e.g. nested ``items``).
+        runs_on: 'input' (PyAutoGUI work on the input thread), 'screen'
+            (capture/OCR on the screen executor) or 'loop' (coroutines and
+            cheap calls, run on the event loop).
+    """
+
+    def __init__(self, name: str, handler: Callable, description: str,
+                 params: Optional[Dict[str, Union[str, Dict[str, Any]]]] = None, runs_on: str = "loop"):
+        if runs_on not in RUNNERS:
+            raise ValueError(f"Unknown runner for tool {name}: {runs_on} (expected one of {RUNNERS})")
+        self.name = name
+        self.handler = handler
+        self.description = description
+        self.runs_on = runs_on
+        self.is_async = inspect.iscoroutinefunction(handler)
+        self.metrics = ToolMetrics()
+
+        params = params or {}
+        signature = inspect.signature(handler)
+        parameters = list(signature.parameters.values())[1:]  # skip the executor
+        unknown = set(params) - {p.name for p in parameters}
+        if unknown:
+            raise ValueError(f"Tool {name} documents parameters it does not take: {sorted(unknown)}")
+
+        properties: Dict[str, Dict[str, Any]] = {}
+        self.required: List[str] = []
+        self.validators: Dict[str, Callable[[Any], Any]] = {}
+        self.accepts_extra = False
+        for parameter in parameters:
+            if parameter.kind is parameter.VAR_KEYWORD:
+                self.accepts_extra = True
+                continue
+            if parameter.kind is parameter.VAR_POSITIONAL:
+                continue
+            extra = params.get(parameter.name, {})
+            if isinstance(extra, str):
+                extra = {"description": extra}
+            schema = {**_schema_for(parameter.annotation), **extra}
+            properties[parameter.name] = schema
+            self.validators[parameter.name] = _validator(schema)
+            if parameter.default is parameter.empty:
+                self.required.append(parameter.name)
+
+        self.schema = {"type": "object", "properties": properties, "required": list(self.required)}
+
+    def definition(self) -> Dict[str, Any]:
+        """Function-calling definition sent to Backboard."""
+        return {
+            "type": "function",
+            "function": {"name": self.name, "description": self.description, "parameters": self.schema},
+        }
+
+    def validate(self, arguments: Any) -> Dict[str, Any]:
+        """Check arguments against the parameters and return them coerced.
+
+        Raises:
+            ToolArgumentError: If arguments are missing, unknown or of the wrong type.
+        """
+        if arguments is None:
+            arguments = {}
+        if not isinstance(arguments, dict):
+            raise ToolArgumentError(f"{self.name} expects an object of arguments, got {type(arguments).__name__}")
+        missing = [name for name in self.required if name not in arguments]
+        if missing:
+            raise ToolArgumentError(f"{self.name} is missing required argument(s): {', '.join(missing)}")
+        checked = {}
+        for key, value in arguments.items():
+            validator = self.validators.get(key)
+            if validator is None:
+                if not self.accepts_extra:
+                    raise ToolArgumentError(f"{self.name} got an unexpected argument '{key}'")
+                checked[key] = value
+                continue
+            try:
+                checked[key] = validator(value)
+            except (TypeError, ValueError) as e:
+                raise ToolArgumentError(f"{self.name} argument '{key}': {e}") from None
+        return checked
+
+
+class ToolRegistry:
+    """Tools by name, in registration order."""
+
+    def __init__(self):
+        self.tools: Dict[str, Tool] = {}
+        self.plugins: List[str] = []
+
+    def register(self, tool: Tool) -> Tool:
+        if tool.name in self.tools:
+            raise ValueError(f"Tool '{tool.name}' is already registered")
+        self.tools[tool.name] = tool
+        return tool
+
+    def tool(self, description: str, params: Optional[Dict[str, Union[str, Dict[str, Any]]]] = None,
+             runs_on: str = "loop", name: Optional[str] = None):
+        """Decorator registering a handler as a tool (see ``Tool`` for the arguments).
+
+        The handler is returned unchanged, so methods keep working when
+        called directly. ``name`` defaults to the function name.
+        """
+        def decorator(handler: Callable) -> Callable:
+            self.register(Tool(name or handler.__name__, handler, description, params, runs_on))
+            return handler
+        return decorator
+
+    def definitions(self) -> List[Dict[str, Any]]:
+        """Function-calling definitions of every registered tool."""
+        return [tool.definition() for tool in self.tools.values()]
+
+    @staticmethod
+    def _record(tool: Tool, seconds: float, result: Any):
+        success = isinstance(result, dict) and bool(result.get("success"))
+        tool.metrics.observe(seconds, success)
+        metrics.TOOL_SECONDS.observe(seconds, tool=tool.name)
+        metrics.TOOL_CALLS.inc(tool=tool.name, outcome="success" if success else "failure")
+
+    async def call(self, executor, name: str, arguments: Any) -> Dict[str, Any]:
+        """Validate and run a tool call, recording its latency and outcome.
+
+        Returns:
+            The handler's result dict, or {'success': False, 'error': ...}
+            for unknown tools, invalid arguments and exceptions.
+        """
+        tool = self.tools.get(name)
+        if tool is None:
+            return {"success": False, "error": f"Unknown tool: {name}"}
+        started = time.perf_counter()
+        try:
+            arguments = tool.validate(arguments)
+            if tool.runs_on == "input":
+                result = await executors.INPUT.run(tool.handler, executor, **arguments)
+            elif tool.runs_on == "screen":
+                result = await executors.run_in(executors.SCREEN, tool.handler, executor, **arguments)
+            else:
+                result = tool.handler(executor, **arguments)
+                if tool.is_async or inspect.isawaitable(result):
+                    result = await result
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        self._record(tool, time.perf_counter() - started, result)
+        return result
+
+    def call_sync(self, executor, name: str, arguments: Any) -> Dict[str, Any]:
+        """Run a synchronous tool on the calling thread (input bursts already on the input thread)."""
+        tool = self.tools.get(name)
+        if tool is None:
+            return {"success": False, "error": f"Unknown tool: {name}"}
+        if tool.is_async:
+            raise ValueError(f"Tool '{name}' is a coroutine and cannot run synchronously")
+        started = time.perf_counter()
+        try:
+            result = tool.handler(executor, **tool.validate(arguments))
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        self._record(tool, time.perf_counter() - started, result)
+        return result
+
+    def load_plugins(self, directory: Union[str, Path]) -> List[str]:
+        """Import every ``*.py`` file in ``directory`` so its ``@tool`` handlers register.
+
+        A plugin that fails to import is reported and skipped.
+
+        Returns:
+            Names of the tools the plugins registered.
+        """
+        directory = Path(directory).expanduser()
+        if not directory.is_dir():
+            return []
+        before = set(self.tools)
+        for path in sorted(directory.glob("*.py")):
+            if path.name.startswith("_"):
+                continue
+            module_name = f"remoto_plugins.{path.stem}"
+            if module_name in sys.modules:
+                continue
+            try:
+                spec = importlib.util.spec_from_file_location(module_name, path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+                self.plugins.append(str(path))
+            except Exception as e:
+                sys.modules.pop(module_name, None)
+                print(f"[WARNING] Could not load tool plugin {path}: {e}")
+        return [name for name in self.tools if name not in before]
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tool counters and latency histograms for the /stats endpoint, slowest total first."""
+        ordered = sorted(self.tools.values(), key=lambda t: t.metrics.total, reverse=True)
+        return {tool.name: tool.metrics.stats() for tool in ordered if tool.metrics.calls}
+
+
+registry = ToolRegistry()
+
+# Shorthand used by server/tools.py and plugins
+tool = registry.tool
+
+
+def plugin_dir() -> Path:
+    """Plugin directory from REMOTO_TOOL_PLUGINS (default ~/.remoto/tools)."""
+    value = os.getenv("REMOTO_TOOL_PLUGINS")
+    return Path(value).expanduser() if value else DEFAULT_PLUGIN_DIR
@@ -0,0 +1,177 @@
+"""
+Screen-settle detection for waits after input.
+
+Actions used to be followed by fixed sleeps sized for the slowest case
+(2 s after launching an app, 1.3 s before the final screenshot). Fast apps
+paid the full delay, and slow ones were still screenshotted mid-render.
+``ScreenSettler`` samples cheap downscaled grayscale thumbnails of the screen
+instead and returns as soon as nothing has changed for a quiet window, with a
+hard timeout for screens that never stop moving (video, spinners).
+
+A sample counts as changed when more than ``max_changed`` of its thumbnail
+pixels moved by more than ``pixel_delta`` levels, so a blinking caret or a
+ticking clock does not keep the wait open.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+from server import capture, executors
+
+# Thumbnail compared between samples (width, height)
+THUMBNAIL = (160, 90)
+
+
+class SettleResult(NamedTuple):
+    settled: bool
+    elapsed: float
+    samples: int
+
+
+class _Watch:
+    """Tracks one wait: the last thumbnail and when the screen last changed."""
+
+    def __init__(self, settler: "ScreenSettler", quiet: Optional[float], timeout: Optional[float],
+                 started: float):
+        self.settler = settler
+        self.quiet = settler.quiet if quiet is None else quiet
+        self.timeout = settler.timeout if timeout is None else timeout
+        self.started = started
+        self.last_change = started
+        self.previous: Optional[np.ndarray] = None
+        self.samples = 0
+
+    def step(self, thumb: np.ndarray) -> Optional[SettleResult]:
+        """Record a sample; return the result once settled or timed out."""
+        now = time.monotonic()
+        self.samples += 1
+        if self.previous is None or self.settler.changed(self.previous, thumb):
+            self.last_change = now
+        self.previous = thumb
+        if now - self.last_change >= self.quiet:
+            return SettleResult(True, now - self.started, self.samples)
+        if now - self.started >= self.timeout:
+            return SettleResult(False, now - self.started, self.samples)
+        return None
+
+
+class ScreenSettler:
+    """Waits until the screen stops changing.
+
+    Args:
+        quiet: Seconds without a change before the screen counts as settled.
+        timeout: Maximum seconds to wait.
+        interval: Seconds between samples.
+        pixel_delta: Gray levels a thumbnail pixel must move to count as changed.
+        max_changed: Fraction of changed thumbnail pixels tolerated as noise.
+        sample: Callable returning the current screen as an RGB array;
+            defaults to a direct capture.
+    """
+
+    def __init__(self, quiet: float = 0.3, timeout: float = 3.0, interval: float = 0.05,
+                 pixel_delta: int = 24, max_changed: float = 0.002,
+                 sample: Optional[Callable[[], np.ndarray]] = None):
+        self.quiet = quiet
+        self.timeout = timeout
+        self.interval = interval
+        self.pixel_delta = pixel_delta
+        self.max_changed = max_changed
+        self.sample = sample or capture.grab_screen
+        self.counts = {"waits": 0, "settled": 0, "timeouts": 0, "errors": 0}
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def thumbnail(self) -> np.ndarray:
+        """Sample the screen and shrink it to a small grayscale thumbnail."""
+        small = cv2.resize(self.sample(), THUMBNAIL, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+    def changed(self, previous: np.ndarray, current: np.ndarray) -> bool:
+        """True if enough thumbnail pixels moved to count as a real change."""
+        moved = np.count_nonzero(cv2.absdiff(previous, current) > self.pixel_delta)
+        return moved > self.max_changed * current.size
+
+    def _finish(self, result: SettleResult, label: str) -> SettleResult:
+        with self._lock:
+            self.counts["waits"] += 1
+            self.counts["settled" if result.settled else "timeouts"] += 1
+            self.total_wait += result.elapsed
+        if not result.settled:
+            print(f"[Settle] {label or 'screen'} still changing after {result.elapsed:.1f}s")
+        return result
+
+    def _failed(self, error: Exception, started: float) -> SettleResult:
+        with self._lock:
+            self.counts["errors"] += 1
+        print(f"[WARNING] Screen settle sampling failed: {error}")
+        return SettleResult(False, time.monotonic() - started, 0)
+
+    def wait(self, quiet: Optional[float] = None, timeout: Optional[float] = None,
+             min_wait: float = 0.0, label: str = "") -> SettleResult:
+        """Block until the screen has been still for ``quiet`` seconds, or ``timeout`` passes.
+
+        Args:
+            quiet: Override of the quiet window for this wait.
+            timeout: Override of the hard timeout for this wait.
+            min_wait: Seconds to sleep before sampling, for actions whose
+                effect takes a moment to start (e.g. an app launching).
+            label: Name used in the log line when the wait times out.
+
+        Returns:
+            SettleResult with 'settled' (False on timeout), 'elapsed' seconds
+            (including ``min_wait``) and the number of samples taken.
+        """
+        started = time.monotonic()
+        if min_wait > 0:
+            time.sleep(min_wait)
+        watch = _Watch(self, quiet, timeout, started)
+        try:
+            while True:
+                result = watch.step(self.thumbnail())
+                if result is not None:
+                    return self._finish(result, label)
+                time.sleep(self.interval)
+        except Exception as e:
+            time.sleep(watch.quiet)  # no way to observe the screen; wait one quiet window
+            return self._failed(e, started)
+
+    async def wait_async(self, quiet: Optional[float] = None, timeout: Optional[float] = None,
+                         min_wait: float = 0.0, label: str = "") -> SettleResult:
+        """Like ``wait`` but sleeps on the event loop; only sampling runs on the screen executor."""
+        started = time.monotonic()
+        if min_wait > 0:
+            await asyncio.sleep(min_wait)
+        watch = _Watch(self, quiet, timeout, started)
+        try:
+            while True:
+                result = watch.step(await executors.run_in(executors.SCREEN, self.thumbnail))
+                if result is not None:
+                    return self._finish(result, label)
+                await asyncio.sleep(self.interval)
+        except Exception as e:
+            await asyncio.sleep(watch.quiet)
+            return self._failed(e, started)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the /stats endpoint."""
+        waits = self.counts["waits"]
+        return {
+            **self.counts,
+            "avg_wait": round(self.total_wait / waits, 3) if waits else 0.0,
+        }
+
+
+def from_env(sample: Optional[Callable[[], np.ndarray]] = None) -> ScreenSettler:
+    """Build the settler from REMOTO_SETTLE_* environment variables."""
+    return ScreenSettler(
+        quiet=float(os.getenv("REMOTO_SETTLE_QUIET", "0.3")),
+        timeout=float(os.getenv("REMOTO_SETTLE_TIMEOUT", "3.0")),
+        interval=float(os.getenv("REMOTO_SETTLE_INTERVAL", "0.05")),
+        sample=sample,
+    )
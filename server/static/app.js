@@ -1,9 +1,10 @@
 /**
  * Remoto AI -- Frontend Application
  *
- * Handles text commands, authentication, live video stream configuration,
- * chat history rendering, and the analysis panel (model info, complexity,
- * tool calls).
+ * Handles text commands (over a persistent WebSocket, or streamed with
+ * server-sent events, when available), authentication, live video stream
+ * configuration, chat history rendering, and the analysis panel (model
+ * info, complexity, tool calls).
  */
 
 /** @type {Array<{role: string, content: string}>} Rolling conversation history (max 10) */
@@ -226,9 +227,289 @@ function hideCommandNotification() {
     commandNotification.classList.remove("show");
 }
 
+/** @type {boolean} Whether the backend offers the streaming /command/stream endpoint */
+let streamingAvailable = true;
+
+/** @type {WebSocket|null} Authenticated command socket, when connected */
+let commandSocket = null;
+
+/** @type {Promise<boolean>|null} In-flight socket connection attempt */
+let socketConnecting = null;
+
+/**
+ * @type {Map<string, Object>} Commands awaiting replies on the socket, by command id.
+ * Several may be pending, but the server runs them one at a time in send order.
+ */
+const pendingCommands = new Map();
+
+/** @type {string|null} Object URL of the latest screenshot received over the socket */
+let latestScreenshotUrl = null;
+
+/** @type {number} Counter for socket command ids */
+let commandCounter = 0;
+
+/**
+ * Open the /ws command socket and authenticate with the session password.
+ * Resolves false (and the HTTP endpoints are used) if the socket cannot be
+ * opened or authenticated within a few seconds.
+ * @returns {Promise<boolean>} True once the server reports the socket ready.
+ */
+function connectSocket() {
+    if (commandSocket && commandSocket.readyState === WebSocket.OPEN) {
+        return Promise.resolve(true);
+    }
+    if (socketConnecting) {
+        return socketConnecting;
+    }
+    if (!sessionPassword || !("WebSocket" in window)) {
+        return Promise.resolve(false);
+    }
+
+    socketConnecting = new Promise((resolve) => {
+        const protocol = location.protocol === "https:" ? "wss:" : "ws:";
+        const socket = new WebSocket(`${protocol}//${location.host}/ws`);
+        socket.binaryType = "blob";
+        let ready = false;
+        let screenshotFor = null;
+
+        const timer = setTimeout(() => {
+            if (!ready) {
+                socket.close();
+                resolve(false);
+            }
+        }, 5000);
+
+        socket.onopen = () => {
+            socket.send(JSON.stringify({ type: "auth", password: sessionPassword }));
+        };
+
+        socket.onmessage = (message) => {
+            // Binary frames carry the screenshot announced by the preceding header
+            if (typeof message.data !== "string") {
+                if (latestScreenshotUrl) {
+                    URL.revokeObjectURL(latestScreenshotUrl);
+                }
+                latestScreenshotUrl = URL.createObjectURL(message.data);
+                const pending = pendingCommands.get(screenshotFor);
+                if (pending) {
+                    pending.screenshotUrl = latestScreenshotUrl;
+                }
+                return;
+            }
+
+            const data = JSON.parse(message.data);
+            if (data.type === "ready") {
+                ready = true;
+                clearTimeout(timer);
+                commandSocket = socket;
+                resolve(true);
+                return;
+            }
+            if (data.type === "screenshot") {
+                screenshotFor = data.id;
+                return;
+            }
+
+            const pending = pendingCommands.get(data.id);
+            if (!pending) {
+                return;
+            }
+            if (data.type === "event") {
+                try {
+                    pending.onEvent(data.event, data.data);
+                } catch (error) {
+                    console.error("Event handler error:", error);
+                }
+            } else if (data.type === "done") {
+                pendingCommands.delete(data.id);
+                pending.resolve({ ...data, screenshot_url: pending.screenshotUrl || null });
+            } else if (data.type === "error") {
+                pendingCommands.delete(data.id);
+                pending.reject(new Error(data.error || "Command failed"));
+            }
+        };
+
+        socket.onclose = () => {
+            clearTimeout(timer);
+            if (commandSocket === socket) {
+                commandSocket = null;
+            }
+            pendingCommands.forEach((pending) => pending.reject(new Error("Connection lost")));
+            pendingCommands.clear();
+            if (!ready) {
+                resolve(false);
+            }
+        };
+    });
+
+    socketConnecting.finally(() => {
+        socketConnecting = null;
+    });
+    return socketConnecting;
+}
+
+/**
+ * Send a command over the WebSocket and render progress as events arrive.
+ * @param {{text: string, thread_id: string|null}} request - Command payload.
+ * @returns {Promise<Object|null>} The final 'done' message, or null if the socket is unavailable.
+ */
+async function sendCommandSocket(request) {
+    if (!(await connectSocket())) {
+        return null;
+    }
+
+    const id = `cmd-${++commandCounter}`;
+    let assistantShown = false;
+
+    const result = await new Promise((resolve, reject) => {
+        pendingCommands.set(id, {
+            resolve,
+            reject,
+            onEvent: (event, data) => {
+                if (handleProgressEvent(event, data)) {
+                    assistantShown = true;
+                }
+            },
+        });
+        commandSocket.send(JSON.stringify({ type: "command", id: id, ...request }));
+    });
+
+    result.assistantShown = assistantShown;
+    result.streamed = true;
+    return result;
+}
+
 /**
- * Send a voice/text command to the backend /voice endpoint.
- * Updates the chat history, analysis panel, and plays the audio response.
+ * Render one progress event from the stream or socket.
+ * @param {string} event - Event name ('classification', 'tool_result', 'assistant', ...).
+ * @param {Object} data - Event payload.
+ * @returns {boolean} True if the event displayed the assistant's reply.
+ */
+function handleProgressEvent(event, data) {
+    if (event === 'status' && data.stage === 'queued') {
+        commandText.textContent += ' (waiting for the previous command)';
+    } else if (event === 'classification') {
+        updateModelInfo(data.model, data.complexity);
+    } else if (event === 'tool_result') {
+        addToolCall(data.tool, data.args, data.result);
+    } else if (event === 'assistant') {
+        addChatMessage('assistant', data.message);
+        return true;
+    }
+    return false;
+}
+
+/**
+ * Parse a server-sent event stream from a fetch response body.
+ * EventSource cannot POST or send auth headers, so the stream is read by hand.
+ * @param {Response} response - Streaming fetch response.
+ * @param {function(string, Object): void} onEvent - Called with (event, data) for each event.
+ */
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            const dataLines = [];
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event:')) {
+                    event = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    dataLines.push(line.slice(5).trimStart());
+                }
+            }
+            if (dataLines.length) {
+                onEvent(event, JSON.parse(dataLines.join('\n')));
+            }
+        }
+    }
+}
+
+/**
+ * Send a command to /command/stream and render progress as events arrive.
+ * @param {{text: string, thread_id: string|null}} request - Command payload.
+ * @returns {Promise<Object|null>} The final 'done' event data, or null if streaming is unavailable.
+ */
+async function sendCommandStream(request) {
+    const response = await fetch("/command/stream", {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+            ...getAuthHeaders()
+        },
+        body: JSON.stringify(request),
+    });
+    
+    if (response.status === 404 || response.status === 405 || !response.body) {
+        streamingAvailable = false;
+        return null;
+    }
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    let result = null;
+    let assistantShown = false;
+    
+    await readEventStream(response, (event, data) => {
+        if (handleProgressEvent(event, data)) {
+            assistantShown = true;
+        } else if (event === 'done') {
+            result = data;
+        } else if (event === 'error') {
+            throw new Error(data.error || 'Command failed');
+        }
+    });
+    
+    if (!result) {
+        throw new Error('Stream ended before the command finished');
+    }
+    result.assistantShown = assistantShown;
+    result.streamed = true;
+    return result;
+}
+
+/**
+ * Send a command to /command and wait for the complete response.
+ * @param {{text: string, thread_id: string|null}} request - Command payload.
+ * @returns {Promise<Object>} The CommandResponse JSON.
+ */
+async function sendCommandOnce(request) {
+    const response = await fetch("/command", {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+            ...getAuthHeaders()
+        },
+        body: JSON.stringify(request),
+    });
+
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    return await response.json();
+}
+
+/**
+ * Send a text command to the backend.
+ * Prefers the persistent /ws socket, then the /command/stream endpoint, so
+ * classification, tool calls and the reply appear as they happen; falls
+ * back to /command if neither is available.
+ * Updates the chat history and analysis panel.
  * @param {string} text - The command text to send.
  */
 async function sendCommand(text) {
@@ -245,23 +526,18 @@ async function sendCommand(text) {
             await initializeAuth();
         }
 
-        const response = await fetch("/command", {
-            method: "POST",
-            headers: {
-                "Content-Type": "application/json",
-                ...getAuthHeaders()
-            },
-            body: JSON.stringify({
-                text: text,
-                thread_id: threadId,
-            }),
-        });
-
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+        const request = {
+            text: text,
+            thread_id: threadId,
+        };
+        
+        let result = await sendCommandSocket(request);
+        if (!result && streamingAvailable) {
+            result = await sendCommandStream(request);
+        }
+        if (!result) {
+            result = await sendCommandOnce(request);
         }
-
-        const result = await response.json();
         
         // Store thread ID for persistent memory
         if (result.thread_id) {
@@ -283,11 +559,13 @@ async function sendCommand(text) {
             conversationHistory = conversationHistory.slice(-10);
         }
 
-        // Add assistant message to chat
-        addChatMessage('assistant', result.assistant_message);
+        // Add assistant message to chat (already shown if it was streamed)
+        if (!result.assistantShown) {
+            addChatMessage('assistant', result.assistant_message);
+        }
         
-        // Update analysis panel from response
-        if (result.analysis) {
+        // Update analysis panel from response (streamed commands rendered it live)
+        if (result.analysis && !result.streamed) {
             updateModelInfo(result.analysis.model, result.analysis.complexity);
             
             if (result.analysis.tool_calls) {
@@ -349,4 +627,5 @@ textInput.addEventListener("keypress", (e) => {
 window.addEventListener("load", async () => {
     await initializeAuth();
     initializeStream();
+    connectSocket();
 });
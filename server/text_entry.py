@@ -0,0 +1,145 @@
+"""
+Typing strategies for ``type_text``.
+
+``pyautogui.write`` sends one key event per character with a delay between
+them: a 2,000-character email takes 100 s at the default 0.05 s interval,
+and characters outside ASCII are silently dropped because there is no key to
+press for them. ``TextTyper`` pastes such text through the clipboard instead
+and restores the user's clipboard afterwards.
+
+Newlines and tabs always go out as real Enter/Tab presses, since apps give
+them key semantics (send, next field, indent) that a paste would not
+trigger. Text between them is pasted when it is long or non-ASCII and typed
+otherwise. Pasting needs ``pyperclip``, which PyAutoGUI already installs;
+without it, text is typed.
+
+``pyperclip`` only reads text, so a clipboard holding an image or files reads
+as empty and could not be restored. In that case, or when the clipboard is
+genuinely empty, nothing is pasted and the text is typed instead (non-ASCII
+characters may then be lost, but the user's clipboard is kept).
+"""
+
+import os
+import re
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import pyautogui
+
+MODES = ("auto", "keys", "paste")
+
+# Characters sent as key presses in every mode
+_KEY_CHARS = re.compile(r"(\r\n|\n|\r|\t)")
+_KEY_NAMES = {"\r\n": "enter", "\n": "enter", "\r": "enter", "\t": "tab"}
+
+# Seconds for the target app to read the clipboard before it changes again; slow
+# targets (Electron apps, remote desktops, busy browsers) need a generous margin
+PASTE_SETTLE = 0.5
+
+
+def _clipboard():
+    """The pyperclip module, or None when clipboard access is unavailable."""
+    try:
+        import pyperclip
+    except ImportError:
+        return None
+    return pyperclip
+
+
+def segments(text: str) -> List[Tuple[str, str]]:
+    """Split text into ('text', chunk) runs and ('key', key name) presses for newlines/tabs."""
+    parts = []
+    for part in _KEY_CHARS.split(text):
+        if part in _KEY_NAMES:
+            parts.append(("key", _KEY_NAMES[part]))
+        elif part:
+            parts.append(("text", part))
+    return parts
+
+
+class TextTyper:
+    """Types text with keystrokes or by pasting through the clipboard.
+
+    Args:
+        mode: 'auto' (paste runs of at least ``threshold`` characters or any
+            non-ASCII run, type the rest), 'keys' (always type) or 'paste'
+            (paste every run of text).
+        threshold: Run length from which 'auto' mode pastes.
+        paste_settle: Seconds to wait after each paste before the clipboard
+            is overwritten or restored.
+    """
+
+    def __init__(self, mode: str = "auto", threshold: int = 64, paste_settle: float = PASTE_SETTLE):
+        if mode not in MODES:
+            raise ValueError(f"Unknown typing mode: {mode} (expected one of {MODES})")
+        self.mode = mode
+        self.threshold = threshold
+        self.paste_settle = paste_settle
+        self.paste_keys = ("command", "v") if sys.platform == "darwin" else ("ctrl", "v")
+
+    def should_paste(self, chunk: str) -> bool:
+        """True if a run of text (without newlines/tabs) should be pasted."""
+        if self.mode == "keys":
+            return False
+        if self.mode == "paste":
+            return True
+        return len(chunk) >= self.threshold or not chunk.isascii()
+
+    def _paste(self, clipboard, chunk: str):
+        clipboard.copy(chunk)
+        pyautogui.hotkey(*self.paste_keys)
+        time.sleep(self.paste_settle)
+
+    def type(self, text: str, interval: float = 0.05) -> str:
+        """Enter ``text`` into the focused control (blocking).
+
+        Args:
+            text: Text to enter.
+            interval: Delay between keystrokes for typed runs.
+
+        Returns:
+            'keys', 'paste' or 'mixed', describing how the text went out.
+        """
+        parts = segments(text)
+        clipboard = _clipboard() if any(kind == "text" and self.should_paste(chunk) for kind, chunk in parts) else None
+        saved: Optional[str] = None
+        if clipboard is not None:
+            try:
+                saved = clipboard.paste()
+            except Exception as e:
+                print(f"[WARNING] Clipboard unavailable, typing instead: {e}")
+                clipboard = None
+            else:
+                if not isinstance(saved, str) or not saved:
+                    # Empty, or content pyperclip cannot read back (image, files)
+                    print("[Typing] Clipboard holds no text; typing instead so its contents are kept")
+                    clipboard, saved = None, None
+
+        used = set()
+        try:
+            for kind, chunk in parts:
+                if kind == "key":
+                    pyautogui.press(chunk)
+                elif clipboard is not None and self.should_paste(chunk):
+                    self._paste(clipboard, chunk)
+                    used.add("paste")
+                else:
+                    pyautogui.write(chunk, interval=interval)
+                    used.add("keys")
+        finally:
+            if clipboard is not None and saved is not None:
+                try:
+                    clipboard.copy(saved)
+                except Exception as e:
+                    print(f"[WARNING] Could not restore clipboard: {e}")
+        return used.pop() if len(used) == 1 else ("mixed" if used else "keys")
+
+
+def from_env() -> TextTyper:
+    """Build the typer from REMOTO_TYPING_MODE, REMOTO_PASTE_THRESHOLD and REMOTO_PASTE_SETTLE."""
+    return TextTyper(
+        mode=os.getenv("REMOTO_TYPING_MODE", "auto").lower(),
+        threshold=int(os.getenv("REMOTO_PASTE_THRESHOLD", "64")),
+        paste_settle=float(os.getenv("REMOTO_PASTE_SETTLE", str(PASTE_SETTLE))),
+    )
@@ -0,0 +1,117 @@
+"""
+Pool of pre-created Backboard threads for one-off utility queries.
+
+Task classification and the vision fallback in ``find_and_click`` used to
+create a brand-new Backboard thread for every query and never delete it:
+one extra network round trip per command or vision click, and thousands of
+abandoned threads per day in the account. ``UtilityThreadPool`` pre-creates
+a few threads at startup and lends them out instead.
+
+A Backboard thread keeps its message history, so each one answers exactly
+one query: once returned it is deleted and a fresh one is created in the
+background. Every query therefore starts from an empty history (no earlier
+commands or screenshots ride along) while borrowing still costs no round
+trip as long as the pool keeps up.
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+
+class UtilityThreadPool:
+    """Pre-created, single-use Backboard threads borrowed for stateless queries.
+
+    Args:
+        name: Label used in log lines and stats.
+        size: Fresh threads kept ready.
+    """
+
+    def __init__(self, name: str, size: int = 2):
+        self.name = name
+        self.size = max(0, size)
+        self.client = None
+        self.assistant_id: Optional[str] = None
+        self.idle: Deque[str] = deque()
+        self.pending = 0
+        self.counts = {"borrowed": 0, "created": 0, "retired": 0, "misses": 0}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def warm(self, client, assistant_id: str):
+        """Attach the Backboard client and pre-create ``size`` threads."""
+        self.client = client
+        self.assistant_id = assistant_id
+        await self._replenish()
+        print(f"[OK] {self.name} thread pool warmed ({len(self.idle)} threads)")
+
+    async def _create(self) -> str:
+        if self.client is None:
+            raise RuntimeError(f"{self.name} thread pool used before warm()")
+        thread = await self.client.create_thread(assistant_id=self.assistant_id)
+        self.counts["created"] += 1
+        return str(thread.thread_id)
+
+    async def _replenish(self):
+        """Create threads until ``size`` are idle or being created."""
+        missing = self.size - len(self.idle) - self.pending
+        if missing <= 0:
+            return
+        self.pending += missing
+        try:
+            results = await asyncio.gather(*(self._create() for _ in range(missing)), return_exceptions=True)
+        finally:
+            self.pending -= missing
+        for result in results:
+            if isinstance(result, BaseException):
+                print(f"[WARNING] {self.name} thread pool could not create a thread: {result}")
+            else:
+                self.idle.append(result)
+
+    async def _delete(self, thread_id: str):
+        try:
+            await self.client.delete_thread(thread_id)
+        except Exception as e:
+            print(f"[WARNING] {self.name} thread pool could not delete thread {thread_id}: {e}")
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _retire(self, thread_id: str):
+        self.counts["retired"] += 1
+        self._spawn(self._delete(thread_id))
+        self._spawn(self._replenish())
+
+    @asynccontextmanager
+    async def borrow(self) -> AsyncIterator[str]:
+        """Lend a fresh thread ID for one query; it is deleted and replaced afterwards.
+
+        Falls back to creating a thread on the spot when none is idle (all
+        lent out, or the pool is still warming).
+        """
+        if self.idle:
+            thread_id = self.idle.popleft()
+        else:
+            self.counts["misses"] += 1
+            thread_id = await self._create()
+        self.counts["borrowed"] += 1
+        try:
+            yield thread_id
+        finally:
+            self._retire(thread_id)
+
+    async def close(self):
+        """Delete idle threads once pending rotations finish (called at shutdown)."""
+        self.size = 0  # stop replenishing
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.client is not None:
+            idle: List[str] = list(self.idle)
+            self.idle.clear()
+            await asyncio.gather(*(self._delete(thread_id) for thread_id in idle))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the /stats endpoint."""
+        return {"idle": len(self.idle), **self.counts}
@@ -1,332 +1,127 @@
 """
 Custom Tools for Remoto AI - Backboard Integration
 
-Defines the JSON schema for each tool (sent to Backboard.io so the LLM knows
-what tools are available) and implements the ToolExecutor class that dispatches
-and runs tool calls locally using PyAutoGUI, Backboard memory, and vision models.
+Implements the ToolExecutor class whose methods run tool calls locally using
+PyAutoGUI, Backboard memory, and vision models. Each tool method is registered
+with ``@tool`` (see ``server/registry.py``), which generates the JSON schema
+sent to Backboard.io so the LLM knows what tools are available.
 """
 
 import pyautogui
 import time
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
-
-# Tool definitions for Backboard
-TOOL_DEFINITIONS = [
-    {
-        "type": "function",
-        "function": {
-            "name": "launch_app",
-            "description": "Open a Windows application using Start menu search",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "app_name": {
-                        "type": "string",
-                        "description": "Application name (e.g., 'chrome', 'vscode', 'notepad')"
-                    }
-                },
-                "required": ["app_name"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "navigate_url",
-            "description": "Open browser and navigate to a URL",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "Website URL to visit"
-                    },
-                    "new_tab": {
-                        "type": "boolean",
-                        "description": "Whether to open in new tab (default: false)"
-                    }
-                },
-                "required": ["url"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "find_and_click",
-            "description": "Find UI element by text using OCR data and click it",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "element_text": {
-                        "type": "string",
-                        "description": "Text on button/link to find and click"
-                    },
-                    "click_type": {
-                        "type": "string",
-                        "description": "Type of click: 'single', 'double', or 'right' (default: 'single')",
-                        "enum": ["single", "double", "right"]
-                    }
-                },
-                "required": ["element_text"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "create_workflow",
-            "description": "Create and save a new multi-step workflow for future use",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "workflow_name": {
-                        "type": "string",
-                        "description": "Name for this workflow (e.g., 'work_mode', 'study_mode')"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Description of what this workflow does"
-                    },
-                    "steps": {
-                        "type": "array",
-                        "description": "List of steps to execute",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "tool": {
-                                    "type": "string",
-                                    "description": "Tool name to execute"
-                                },
-                                "args": {
-                                    "type": "object",
-                                    "description": "Arguments for the tool"
-                                }
-                            }
-                        }
-                    }
-                },
-                "required": ["workflow_name", "steps"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "execute_workflow",
-            "description": "Execute a saved multi-step workflow by name",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "workflow_name": {
-                        "type": "string",
-                        "description": "Name of the workflow to execute (e.g., 'work_mode', 'gaming_mode')"
-                    }
-                },
-                "required": ["workflow_name"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "list_workflows",
-            "description": "List all available saved workflows",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "save_learned_shortcut",
-            "description": "Save a newly discovered keyboard shortcut to memory for future use",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "app": {
-                        "type": "string",
-                        "description": "Application name"
-                    },
-                    "action": {
-                        "type": "string",
-                        "description": "Action description"
-                    },
-                    "shortcut": {
-                        "type": "string",
-                        "description": "Keyboard shortcut (e.g., 'Ctrl+N', 'Alt+F4')"
-                    }
-                },
-                "required": ["app", "action", "shortcut"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "type_text",
-            "description": "Type text on the keyboard",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "text": {
-                        "type": "string",
-                        "description": "Text to type"
-                    },
-                    "interval": {
-                        "type": "number",
-                        "description": "Seconds between each keystroke (default: 0.05)"
-                    }
-                },
-                "required": ["text"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "press_key",
-            "description": "Press a single key (enter, tab, esc, backspace, etc.)",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "key": {
-                        "type": "string",
-                        "description": "Key name (e.g., 'enter', 'tab', 'esc', 'space', 'backspace')"
-                    }
-                },
-                "required": ["key"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "press_hotkey",
-            "description": "Press a keyboard shortcut (key combination)",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "keys": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Keys to press together (e.g., ['ctrl', 'c'] for copy, ['alt', 'tab'] for switch apps)"
-                    }
-                },
-                "required": ["keys"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "click_position",
-            "description": "Click at specific screen coordinates",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "x": {
-                        "type": "number",
-                        "description": "X coordinate from OCR data"
-                    },
-                    "y": {
-                        "type": "number",
-                        "description": "Y coordinate from OCR data"
-                    },
-                    "clicks": {
-                        "type": "number",
-                        "description": "Number of clicks (1 for single, 2 for double, default: 1)"
-                    },
-                    "button": {
-                        "type": "string",
-                        "description": "Mouse button ('left' or 'right', default: 'left')"
-                    }
-                },
-                "required": ["x", "y"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "scroll_page",
-            "description": "Scroll up or down on the page",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "amount": {
-                        "type": "number",
-                        "description": "Scroll amount (positive for up, negative for down, e.g., 3 for up, -5 for down)"
-                    }
-                },
-                "required": ["amount"]
-            }
-        }
-    }
-]
+from typing import Dict, Any, AsyncIterator, List, Literal, Optional, Tuple
 
+import cv2
+
+from server import batch, capture, element_cache, executors, metrics, ocr, settle, text_entry, workflow
+from server.coords import CoordinateMap
+from server.encoding import EncodedFrame
+from server.ocr_index import OcrIndex
+from server.registry import registry, tool
+from server.thread_pool import UtilityThreadPool
 
 class ToolExecutor:
     """Dispatches and executes custom tools for computer control.
 
     Each tool call from the LLM is routed through ``execute()`` to the
-    appropriate method. The executor holds mutable context (OCR data,
-    screenshot, scale factor) that is refreshed before each command
+    method registered for it with ``@tool``. The executor holds mutable context (OCR data,
+    screenshot, coordinate map) that is refreshed before each command
     by the FastAPI endpoint in ``server/main.py``.
 
     Attributes:
         workflows: Dict of saved multi-step workflows loaded from Backboard memory.
-        ocr_data: Raw OCR text with coordinates from the latest screenshot.
-        scale_factor: Ratio to convert 1280x720 OCR coordinates to actual screen pixels.
+        ocr_index: OCR word index (boxes, sizes, confidences) for the latest screenshot.
+        coord_map: Maps screenshot/OCR coordinates to actual screen coordinates.
+        region_index: OCR words from the last ``read_screen_region`` call, in screenshot coordinates.
         backboard_client: BackboardClient for memory and vision operations.
         assistant_id: Backboard assistant ID for memory scoping.
-        screenshot_b64: Base64-encoded screenshot for vision-based element location.
+        screenshot: Encoded screenshot for vision-based element location.
         thread_id: Current Backboard thread ID for vision model queries.
+        vision_threads: Pool of fresh Backboard threads that vision queries borrow.
+        element_cache: Locations of previously clicked elements, checked before OCR/vision.
+        screen_reader: Async callable returning a fresh (screenshot, OCR index, coordinate map),
+            used by workflows that wait for text to appear.
+        checkpoints: Positions of failed workflow runs, for ``execute_workflow(resume=True)``.
     """
     
     def __init__(self):
         self.workflows = {}
-        self.ocr_data = None
-        self.scale_factor = 1.0
+        self.ocr_index: Optional[OcrIndex] = None
+        self.coord_map: Optional[CoordinateMap] = None
+        self.region_index: Optional[OcrIndex] = None
+        self.ocr_matches: Dict[str, Optional[Tuple[int, int]]] = {}
         self.backboard_client = None
         self.assistant_id = None
-        self.screenshot_b64 = None
+        self.screenshot: Optional[EncodedFrame] = None
         self.thread_id = None
+        self.vision_threads: Optional[UtilityThreadPool] = None
+        self.element_cache = element_cache.from_env()
+        self.settler = settle.from_env()
+        self.typer = text_entry.from_env()
+        self.screen_reader: Optional[workflow.ScreenReader] = None
+        self.checkpoints = workflow.checkpoints_from_env()
     
-    def set_ocr_context(self, ocr_data: str, scale_factor: float):
+    def set_ocr_context(self, ocr_index: OcrIndex, coord_map: CoordinateMap):
         """Update the OCR context before processing a new command.
 
         Args:
-            ocr_data: Extracted text with coordinates, e.g. '"Submit" at (850, 600)'.
-            scale_factor: Multiplier to convert 1280px-based coordinates to actual screen pixels.
+            ocr_index: OCR word index built from the current screenshot.
+            coord_map: Converts screenshot coordinates to actual screen coordinates.
         """
-        self.ocr_data = ocr_data
-        self.scale_factor = scale_factor
+        self.ocr_index = ocr_index
+        self.coord_map = coord_map
+        self.region_index = None
+        self.ocr_matches = {}
+    
+    def locate(self, element_text: str) -> Optional[Tuple[int, int]]:
+        """OCR match for ``element_text`` in the current screenshot, memoized until the next one."""
+        if element_text not in self.ocr_matches:
+            self.ocr_matches[element_text] = self.ocr_index.find(element_text) if self.ocr_index is not None else None
+        return self.ocr_matches[element_text]
     
-    def set_vision_context(self, screenshot_b64: str, thread_id: str):
+    def set_vision_context(self, screenshot: EncodedFrame, thread_id: str):
         """Provide the current screenshot for vision-based element location.
 
         Args:
-            screenshot_b64: Base64-encoded PNG of the current screen (1280x720).
+            screenshot: Encoded image of the current screen (at most 1280x720).
             thread_id: Backboard thread ID for sending vision queries.
         """
-        self.screenshot_b64 = screenshot_b64
+        self.screenshot = screenshot
         self.thread_id = thread_id
     
-    def set_backboard_client(self, client, assistant_id: str):
+    def set_screen_reader(self, reader: workflow.ScreenReader):
+        """Provide the coroutine that captures and OCRs the screen on demand.
+
+        Args:
+            reader: Async callable returning (screenshot, OCR index, coordinate map).
+        """
+        self.screen_reader = reader
+    
+    def set_backboard_client(self, client, assistant_id: str, vision_threads: Optional[UtilityThreadPool] = None):
         """Inject the Backboard client for memory and vision operations.
 
         Args:
             client: Initialized BackboardClient instance.
             assistant_id: The Backboard assistant ID to scope memory operations.
+            vision_threads: Optional pool of utility threads for vision queries;
+                without one, each query creates its own thread.
         """
         self.backboard_client = client
         self.assistant_id = assistant_id
+        self.vision_threads = vision_threads
+    
+    @asynccontextmanager
+    async def _vision_thread(self):
+        """Borrow a thread ID for one vision query from the pool (or create one)."""
+        if self.vision_threads is not None:
+            async with self.vision_threads.borrow() as thread_id:
+                yield thread_id
+        else:
+            thread = await self.backboard_client.create_thread(assistant_id=self.assistant_id)
+            yield str(thread.thread_id)
     
     async def load_workflows_from_memory(self):
         """Load saved workflows from Backboard persistent memory into local cache.
@@ -389,45 +184,59 @@ class ToolExecutor:
             return True
     
     async def execute(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Route a tool call to the appropriate handler method.
+        """Validate a tool call's arguments and run the registered handler.
 
         Args:
-            tool_name: Name of the tool to execute (must match a TOOL_DEFINITIONS entry).
+            tool_name: Name of the tool to execute (a registered tool, including plugins).
             arguments: Keyword arguments parsed from the LLM's tool call.
 
+        Blocking PyAutoGUI tools run on the single-threaded input executor,
+        in the order they were issued, so the event loop keeps serving other
+        requests and streaming progress while they type/click. Call counts
+        and latencies are recorded per tool.
+
         Returns:
             Dict with at least 'success' (bool) and either 'message' or 'error'.
         """
-        try:
-            if tool_name == "launch_app":
-                return self.launch_app(**arguments)
-            elif tool_name == "navigate_url":
-                return self.navigate_url(**arguments)
-            elif tool_name == "find_and_click":
-                return await self.find_and_click(**arguments)
-            elif tool_name == "create_workflow":
-                return await self.create_workflow(**arguments)
-            elif tool_name == "execute_workflow":
-                return await self.execute_workflow_async(**arguments)
-            elif tool_name == "list_workflows":
-                return self.list_workflows()
-            elif tool_name == "save_learned_shortcut":
-                return await self.save_learned_shortcut(**arguments)
-            elif tool_name == "type_text":
-                return self.type_text(**arguments)
-            elif tool_name == "press_key":
-                return self.press_key(**arguments)
-            elif tool_name == "press_hotkey":
-                return self.press_hotkey(**arguments)
-            elif tool_name == "click_position":
-                return self.click_position(**arguments)
-            elif tool_name == "scroll_page":
-                return self.scroll_page(**arguments)
+        return await registry.call(self, tool_name, arguments)
+    
+    async def execute_batch(self, calls: List[batch.ToolCall]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Run all tool calls from one LLM turn, yielding (index, result) in call order.
+
+        OCR matches for every ``find_and_click`` target are resolved up front
+        against the current screenshot. Consecutive keyboard/pointer calls are
+        sent as one burst on the input thread (see ``server/batch.py``); other
+        calls go through ``execute``. Each result is the same dict the call
+        would return on its own.
+
+        Args:
+            calls: The turn's tool calls in the order the model issued them.
+        """
+        for call in calls:
+            if call.name == "find_and_click" and isinstance(call.args, dict) and isinstance(call.args.get("element_text"), str):
+                self.locate(call.args["element_text"])
+
+        for step in batch.plan(calls):
+            if step.burst:
+                results = await executors.INPUT.run(self._run_burst, [calls[i] for i in step.indices])
+                for index, result in zip(step.indices, results):
+                    yield index, result
             else:
-                return {"success": False, "error": f"Unknown tool: {tool_name}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+                index = step.indices[0]
+                yield index, await self.execute(calls[index].name, calls[index].args)
     
+    def _run_burst(self, calls: List[batch.ToolCall]) -> List[Dict[str, Any]]:
+        """Run consecutive input calls back to back (blocking; runs on the input executor)."""
+        results = []
+        for position, call in enumerate(calls):
+            results.append(registry.call_sync(self, call.name, call.args))
+            if position < len(calls) - 1 and batch.changes_focus(call):
+                self.settler.wait(quiet=0.15, timeout=1.0, label=f"{call.name} in burst")
+        return results
+    
+    @tool("Open a Windows application using Start menu search", runs_on="input", params={
+        "app_name": "Application name (e.g., 'chrome', 'vscode', 'notepad')",
+    })
     def launch_app(self, app_name: str) -> Dict[str, Any]:
         """Open an application by typing its name into the Start menu search.
 
@@ -439,11 +248,12 @@ class ToolExecutor:
         """
         try:
             pyautogui.press('win')
-            time.sleep(0.5)
+            self.settler.wait(timeout=1.0, label="Start menu")
             pyautogui.write(app_name, interval=0.05)
-            time.sleep(0.3)
+            self.settler.wait(timeout=1.5, label="Start menu search")
             pyautogui.press('enter')
-            time.sleep(2)
+            # The menu closing settles quickly; give the app a moment to start drawing
+            self.settler.wait(quiet=0.5, min_wait=0.4, timeout=5.0, label=app_name)
             
             return {
                 "success": True,
@@ -453,6 +263,10 @@ class ToolExecutor:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @tool("Open browser and navigate to a URL", runs_on="input", params={
+        "url": "Website URL to visit",
+        "new_tab": "Whether to open in new tab (default: false)",
+    })
     def navigate_url(self, url: str, new_tab: bool = False) -> Dict[str, Any]:
         """Focus the browser address bar and navigate to a URL.
 
@@ -473,16 +287,16 @@ class ToolExecutor:
             # Open new tab if requested
             if new_tab:
                 pyautogui.hotkey('ctrl', 't')
-                time.sleep(0.3)
+                self.settler.wait(timeout=1.0, label="new tab")
             
             # Focus address bar
             pyautogui.hotkey('ctrl', 'l')
-            time.sleep(0.3)
+            self.settler.wait(quiet=0.15, timeout=0.5, label="address bar")
             
             # Type URL
             pyautogui.write(url, interval=0.05)
             pyautogui.press('enter')
-            time.sleep(1.5)
+            self.settler.wait(quiet=0.4, min_wait=0.2, timeout=5.0, label=url)
             
             return {
                 "success": True,
@@ -492,64 +306,126 @@ class ToolExecutor:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    async def find_and_click(self, element_text: str, click_type: str = "single") -> Dict[str, Any]:
+    def _click_at(self, x: int, y: int, click_type: str = "single"):
+        """Move to screen coordinates and click (blocking; runs on the input executor)."""
+        pyautogui.moveTo(x, y, duration=0.3)
+
+        if click_type == "double":
+            pyautogui.click(clicks=2)
+        elif click_type == "right":
+            pyautogui.rightClick()
+        else:
+            pyautogui.click()
+
+        self.settler.wait(timeout=1.5, label="click")
+    
+    def _neighbourhood(self, x: float, y: float):
+        """Physical region around a screenshot point and the hash of its current pixels."""
+        width, height = element_cache.NEIGHBOURHOOD
+        region = self.coord_map.region(round(x - width / 2), round(y - height / 2), width, height)
+        if region[2] == 0 or region[3] == 0:
+            return region, None
+        return region, element_cache.neighbourhood_hash(capture.grab_screen(region=region))
+
+    def _cached_location(self, element_text: str):
+        """Return (active window, verified cache entry or None) for ``element_text``."""
+        window = capture.active_window()
+        if not window:
+            self.element_cache.record_skip()
+            return window, None
+        cached = self.element_cache.get(element_text, window)
+        if cached is None:
+            return window, None
+        current = element_cache.neighbourhood_hash(capture.grab_screen(region=cached.region))
+        if current != cached.digest:
+            self.element_cache.invalidate(element_text, window)
+            return window, None
+        self.element_cache.record_hit()
+        return window, cached
+
+    async def _remember(self, element_text: str, window: str, x: float, y: float,
+                        screen: tuple, method: str):
+        """Cache a resolved location; runs before the click so the hash sees the untouched element."""
+        if not self.element_cache.enabled or not window:
+            return
+        try:
+            region, digest = await executors.run_in(executors.SCREEN, self._neighbourhood, x, y)
+            if digest is not None:
+                self.element_cache.put(element_text, window, screen, region, digest, method)
+        except Exception as e:
+            print(f"[Element Cache] Could not hash neighbourhood of '{element_text}': {e}")
+
+    @tool("Find UI element by text using OCR data and click it", params={
+        "element_text": "Text on button/link to find and click",
+        "click_type": "Type of click: 'single', 'double', or 'right' (default: 'single')",
+    })
+    async def find_and_click(self, element_text: str, click_type: Literal["single", "double", "right"] = "single") -> Dict[str, Any]:
         """Locate a UI element on screen and click it using a two-stage strategy.
 
-        Stage 1 (fast): Search the OCR text data for a matching element and use
-        its coordinates. Stage 2 (fallback): If OCR fails, send the screenshot
+        Stage 0 (cached): If this element was resolved before in the same
+        window and the pixels around that spot still hash the same, click
+        there straight away without searching OCR or asking the vision model.
+        Skipped when the active window cannot be identified.
+
+        Stage 1 (fast): Search the OCR index for a matching word or phrase
+        (case-insensitive, tolerant of small OCR typos) and use its
+        coordinates. Stage 2 (fallback): If OCR fails, send the screenshot
         to a vision model (Claude Sonnet) to locate the element visually.
 
-        Coordinates are scaled from the 1280x720 OCR space to the actual screen
-        resolution before clicking.
+        Coordinates are mapped from screenshot space to the actual screen
+        (per-axis scale, monitor offset, DPI) before clicking. Text read by
+        ``read_screen_region`` is searched too.
 
         Args:
             element_text: Text label or description of the element to find.
             click_type: One of 'single', 'double', or 'right'.
 
         Returns:
-            Dict with 'success', 'method' ('ocr' or 'vision'), 'coordinates', and 'message'.
+            Dict with 'success', 'method' ('cache', 'ocr' or 'vision'), 'coordinates', and 'message'.
         """
         try:
+            # STEP 0: Reuse a verified location from an earlier click
+            window = ""
+            if self.element_cache.enabled and self.coord_map is not None:
+                window, cached = await executors.run_in(executors.SCREEN, self._cached_location, element_text)
+                if cached is not None:
+                    scaled_x, scaled_y = cached.screen
+                    await executors.INPUT.run(self._click_at, scaled_x, scaled_y, click_type)
+                    return {
+                        "success": True,
+                        "element": element_text,
+                        "method": "cache",
+                        "coordinates": (scaled_x, scaled_y),
+                        "message": f"Clicked '{element_text}' at ({scaled_x}, {scaled_y}) from cache (found via {cached.method})"
+                    }
+            
             # STEP 1: Try OCR text matching (fast)
-            if self.ocr_data:
-                lines = self.ocr_data.split('\n')
-                for line in lines:
-                    if element_text.lower() in line.lower():
-                        # Extract coordinates
-                        import re
-                        match = re.search(r'\((\d+),\s*(\d+)\)', line)
-                        if match:
-                            x = int(match.group(1))
-                            y = int(match.group(2))
-
-                            # Scale coordinates to actual screen resolution
-                            scaled_x = int(x * self.scale_factor)
-                            scaled_y = int(y * self.scale_factor)
-
-                            # Move and click
-                            pyautogui.moveTo(scaled_x, scaled_y, duration=0.3)
-
-                            if click_type == "double":
-                                pyautogui.click(clicks=2)
-                            elif click_type == "right":
-                                pyautogui.rightClick()
-                            else:
-                                pyautogui.click()
-
-                            time.sleep(0.5)
-
-                            return {
-                                "success": True,
-                                "element": element_text,
-                                "method": "ocr",
-                                "coordinates": (scaled_x, scaled_y),
-                                "message": f"Clicked '{element_text}' at ({scaled_x}, {scaled_y}) via OCR"
-                            }
+            match = self.locate(element_text)
+            if match is None and self.region_index is not None:
+                match = self.region_index.find(element_text)
+            if match:
+                x, y = match
+
+                # Map coordinates to the actual screen
+                scaled_x, scaled_y = self.coord_map.to_screen(x, y)
+                await self._remember(element_text, window, x, y, (scaled_x, scaled_y), "ocr")
+
+                # Move and click
+                await executors.INPUT.run(self._click_at, scaled_x, scaled_y, click_type)
+
+                return {
+                    "success": True,
+                    "element": element_text,
+                    "method": "ocr",
+                    "coordinates": (scaled_x, scaled_y),
+                    "message": f"Clicked '{element_text}' at ({scaled_x}, {scaled_y}) via OCR"
+                }
             
             # STEP 2: OCR failed - try vision-based location
             print(f"[Vision Fallback] OCR couldn't find '{element_text}', using vision model...")
             
-            if not self.backboard_client or not self.thread_id or not self.screenshot_b64:
+            if not self.backboard_client or not self.thread_id or not self.screenshot:
+                metrics.VISION_FALLBACKS.inc(outcome="unavailable")
                 return {
                     "success": False,
                     "error": f"Could not find '{element_text}' on screen (vision unavailable)"
@@ -558,7 +434,7 @@ class ToolExecutor:
             # Ask vision model to locate the element
             vision_prompt = f"""Look at the screenshot carefully. Find the "{element_text}" element (button, icon, link, or any clickable UI element).
 
-The screenshot dimensions are 1280x720 pixels.
+The screenshot dimensions are {self.screenshot.width}x{self.screenshot.height} pixels.
 
 Return ONLY a JSON object with the coordinates of the CENTER of that element:
 {{"x": <number>, "y": <number>, "found": true}}
@@ -569,34 +445,17 @@ If you cannot find "{element_text}", return:
 JSON response:"""
 
             try:
-                # Save screenshot to temporary file
-                import tempfile
-                import base64
-                
-                with tempfile.NamedTemporaryFile(mode='wb', suffix='.png', delete=False) as temp_file:
-                    temp_file.write(base64.b64decode(self.screenshot_b64))
-                    temp_path = temp_file.name
-                
-                # Create a temporary thread for vision query
-                vision_thread = await self.backboard_client.create_thread(assistant_id=self.assistant_id)
-                
-                # Send vision query with screenshot file
-                vision_response = await self.backboard_client.add_message(
-                    thread_id=str(vision_thread.thread_id),
-                    content=vision_prompt,
-                    files=[temp_path],  # Pass file path
-                    llm_provider="anthropic",  # Claude is best for vision
-                    model_name="claude-sonnet-4-20250514",
-                    memory="off",
-                    stream=False
-                )
-                
-                # Clean up temp file
-                import os
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+                # Send vision query with screenshot file on a pooled utility thread
+                async with self._vision_thread() as vision_thread_id:
+                    vision_response = await self.backboard_client.add_message(
+                        thread_id=vision_thread_id,
+                        content=vision_prompt,
+                        files=[self.screenshot.path()],  # Shared on-disk copy of this frame
+                        llm_provider="anthropic",  # Claude is best for vision
+                        model_name="claude-sonnet-4-20250514",
+                        memory="off",
+                        stream=False
+                    )
                 
                 # Parse vision response
                 import json
@@ -613,22 +472,14 @@ JSON response:"""
                         x = int(vision_data["x"])
                         y = int(vision_data["y"])
                         
-                        # Scale coordinates
-                        scaled_x = int(x * self.scale_factor)
-                        scaled_y = int(y * self.scale_factor)
+                        # Map coordinates to the actual screen
+                        scaled_x, scaled_y = self.coord_map.to_screen(x, y)
+                        await self._remember(element_text, window, x, y, (scaled_x, scaled_y), "vision")
                         
                         # Move and click
-                        pyautogui.moveTo(scaled_x, scaled_y, duration=0.3)
-                        
-                        if click_type == "double":
-                            pyautogui.click(clicks=2)
-                        elif click_type == "right":
-                            pyautogui.rightClick()
-                        else:
-                            pyautogui.click()
-                        
-                        time.sleep(0.5)
+                        await executors.INPUT.run(self._click_at, scaled_x, scaled_y, click_type)
                         
+                        metrics.VISION_FALLBACKS.inc(outcome="found")
                         print(f"[Vision Fallback] Successfully located and clicked '{element_text}' at ({scaled_x}, {scaled_y})")
                         
                         return {
@@ -640,6 +491,7 @@ JSON response:"""
                         }
                     else:
                         reason = vision_data.get("reason", "Element not found")
+                        metrics.VISION_FALLBACKS.inc(outcome="not_found")
                         return {
                             "success": False,
                             "error": f"Vision model: {reason}"
@@ -647,11 +499,13 @@ JSON response:"""
                 
             except Exception as vision_error:
                 print(f"[Vision Fallback] Error: {vision_error}")
+                metrics.VISION_FALLBACKS.inc(outcome="error")
                 return {
                     "success": False,
                     "error": f"Could not find '{element_text}' on screen (vision failed: {str(vision_error)[:100]})"
                 }
             
+            metrics.VISION_FALLBACKS.inc(outcome="not_found")
             return {
                 "success": False,
                 "error": f"Could not find '{element_text}' on screen"
@@ -660,17 +514,25 @@ JSON response:"""
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    async def execute_workflow_async(self, workflow_name: str) -> Dict[str, Any]:
+    @tool("Execute a saved multi-step workflow by name", name="execute_workflow", params={
+        "workflow_name": "Name of the workflow to execute (e.g., 'work_mode', 'gaming_mode')",
+        "resume": "Continue from the step that failed in the last run instead of starting over",
+    })
+    async def execute_workflow_async(self, workflow_name: str, resume: bool = False) -> Dict[str, Any]:
         """Run a previously saved multi-step workflow by name.
 
-        Executes each step sequentially with a brief pause between steps.
-        Stops immediately if any step fails.
+        Steps run in order, each followed by its wait condition (text on
+        screen, screen settled, or a fixed pause); consecutive no-input steps
+        run concurrently. Stops at the first failing step and checkpoints
+        it, see ``server/workflow.py``.
 
         Args:
             workflow_name: Name of the saved workflow to execute.
+            resume: Start at the step where the last run of this workflow failed.
 
         Returns:
-            Dict with 'success', 'steps_completed', and 'message' or 'error'.
+            Dict with 'success', 'steps_completed', and 'message', or 'error',
+            'completed_steps' and 'failed_step' on failure.
         """
         try:
             if workflow_name not in self.workflows:
@@ -679,38 +541,12 @@ JSON response:"""
                     "error": f"Workflow '{workflow_name}' not found. Available workflows: {list(self.workflows.keys())}"
                 }
             
-            workflow = self.workflows[workflow_name]
-            results = []
-            
-            for step in workflow.get('steps', []):
-                tool_name = step.get('tool')
-                args = step.get('args', {})
-                
-                # Execute the step
-                result = await self.execute(tool_name, args)
-                results.append(result)
-                
-                # Stop if any step fails
-                if not result.get('success'):
-                    return {
-                        "success": False,
-                        "workflow": workflow_name,
-                        "error": f"Step failed: {result.get('error')}",
-                        "completed_steps": len(results) - 1
-                    }
-                
-                # Brief pause between steps
-                time.sleep(0.5)
-            
-            return {
-                "success": True,
-                "workflow": workflow_name,
-                "steps_completed": len(results),
-                "message": f"Executed workflow '{workflow_name}' with {len(results)} steps"
-            }
+            runner = workflow.WorkflowRunner(self, self.checkpoints)
+            return await runner.run(workflow_name, self.workflows[workflow_name].get('steps', []), resume=resume)
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @tool("List all available saved workflows")
     def list_workflows(self) -> Dict[str, Any]:
         """Return metadata for all saved workflows.
 
@@ -719,11 +555,11 @@ JSON response:"""
         """
         try:
             workflows_info = []
-            for name, workflow in self.workflows.items():
+            for name, saved in self.workflows.items():
                 workflows_info.append({
                     "name": name,
-                    "description": workflow.get('description', ''),
-                    "steps_count": len(workflow.get('steps', []))
+                    "description": saved.get('description', ''),
+                    "steps_count": len(saved.get('steps', []))
                 })
             
             return {
@@ -735,12 +571,38 @@ JSON response:"""
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    async def create_workflow(self, workflow_name: str, steps: list, description: str = "") -> Dict[str, Any]:
+    @tool("Create and save a new multi-step workflow for future use", params={
+        "workflow_name": "Name for this workflow (e.g., 'work_mode', 'study_mode')",
+        "description": "Description of what this workflow does",
+        "steps": {
+            "description": "List of steps to execute",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "tool": {"type": "string", "description": "Tool name to execute"},
+                    "args": {"type": "object", "description": "Arguments for the tool"},
+                    "wait": {
+                        "type": "object",
+                        "description": "What to wait for after the step: {\"text\": \"Inbox\", \"timeout\": 20} "
+                                       "until the text appears on screen, {\"settle\": true} until the screen stops "
+                                       "changing (default), {\"seconds\": 2} for a fixed pause, "
+                                       "or {\"settle\": false} for none",
+                    },
+                    "independent": {
+                        "type": "boolean",
+                        "description": "True if the step sends no keyboard or mouse input and may run alongside neighbouring independent steps",
+                    },
+                },
+            },
+        },
+    })
+    async def create_workflow(self, workflow_name: str, steps: List[Dict[str, Any]], description: str = "") -> Dict[str, Any]:
         """Define and persist a new multi-step workflow.
 
         Args:
             workflow_name: Unique name for the workflow (e.g. 'work_mode').
-            steps: List of step dicts, each with 'tool' and 'args' keys.
+            steps: List of step dicts, each with 'tool' and 'args' keys and optional
+                'wait' and 'independent' keys (see ``server/workflow.py``).
             description: Human-readable description of the workflow's purpose.
 
         Returns:
@@ -772,6 +634,11 @@ JSON response:"""
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @tool("Save a newly discovered keyboard shortcut to memory for future use", params={
+        "app": "Application name",
+        "action": "Action description",
+        "shortcut": "Keyboard shortcut (e.g., 'Ctrl+N', 'Alt+F4')",
+    })
     async def save_learned_shortcut(self, app: str, action: str, shortcut: str) -> Dict[str, Any]:
         """Persist a newly discovered keyboard shortcut to Backboard memory.
 
@@ -809,26 +676,38 @@ JSON response:"""
             print(f"Error saving learned shortcut: {e}")
             return {"success": False, "error": str(e)}
     
+    @tool("Type text on the keyboard", runs_on="input", params={
+        "text": "Text to type",
+        "interval": "Seconds between each keystroke (default: 0.05)",
+    })
     def type_text(self, text: str, interval: float = 0.05) -> Dict[str, Any]:
-        """Simulate typing text on the keyboard character by character.
+        """Enter text into the focused control.
+
+        Short ASCII text is typed character by character; long or non-ASCII
+        runs are pasted through the clipboard (restored afterwards), and
+        newlines/tabs are always pressed as keys. See ``server/text_entry.py``.
 
         Args:
             text: The string to type.
-            interval: Delay in seconds between each keystroke.
+            interval: Delay in seconds between each typed keystroke.
 
         Returns:
-            Dict with 'success' and 'message'.
+            Dict with 'success', 'method' ('keys', 'paste' or 'mixed') and 'message'.
         """
         try:
-            pyautogui.write(text, interval=interval)
+            method = self.typer.type(text, interval=interval)
             return {
                 "success": True,
                 "text": text,
+                "method": method,
                 "message": f"Typed: {text[:50]}{'...' if len(text) > 50 else ''}"
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @tool("Press a single key (enter, tab, esc, backspace, etc.)", runs_on="input", params={
+        "key": "Key name (e.g., 'enter', 'tab', 'esc', 'space', 'backspace')",
+    })
     def press_key(self, key: str) -> Dict[str, Any]:
         """Press and release a single keyboard key.
 
@@ -848,7 +727,10 @@ JSON response:"""
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def press_hotkey(self, keys: list) -> Dict[str, Any]:
+    @tool("Press a keyboard shortcut (key combination)", runs_on="input", params={
+        "keys": "Keys to press together (e.g., ['ctrl', 'c'] for copy, ['alt', 'tab'] for switch apps)",
+    })
+    def press_hotkey(self, keys: List[str]) -> Dict[str, Any]:
         """Press a keyboard shortcut (multiple keys held simultaneously).
 
         Args:
@@ -868,11 +750,17 @@ JSON response:"""
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def click_position(self, x: int, y: int, clicks: int = 1, button: str = 'left') -> Dict[str, Any]:
+    @tool("Click at specific screen coordinates", runs_on="input", params={
+        "x": "X coordinate from OCR data",
+        "y": "Y coordinate from OCR data",
+        "clicks": "Number of clicks (1 for single, 2 for double, default: 1)",
+        "button": "Mouse button ('left' or 'right', default: 'left')",
+    })
+    def click_position(self, x: float, y: float, clicks: int = 1, button: str = 'left') -> Dict[str, Any]:
         """Click at specific screen coordinates (auto-scaled from OCR space).
 
-        Coordinates are expected in the 1280x720 OCR coordinate space and are
-        multiplied by ``self.scale_factor`` to reach actual screen pixels.
+        Coordinates are expected in screenshot/OCR space and are converted
+        to actual screen coordinates with ``self.coord_map``.
 
         Args:
             x: X coordinate in OCR space.
@@ -884,9 +772,8 @@ JSON response:"""
             Dict with 'success', scaled coordinates, and 'message'.
         """
         try:
-            # Scale coordinates using the scale factor
-            scaled_x = int(x * self.scale_factor)
-            scaled_y = int(y * self.scale_factor)
+            # Map coordinates to the actual screen
+            scaled_x, scaled_y = self.coord_map.to_screen(x, y)
             
             if button == 'right':
                 pyautogui.rightClick(scaled_x, scaled_y)
@@ -907,6 +794,9 @@ JSON response:"""
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @tool("Scroll up or down on the page", runs_on="input", params={
+        "amount": "Scroll amount (positive for up, negative for down, e.g., 3 for up, -5 for down)",
+    })
     def scroll_page(self, amount: int) -> Dict[str, Any]:
         """Scroll the mouse wheel up or down.
 
@@ -926,3 +816,58 @@ JSON response:"""
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+    @tool("OCR a region of the screen at full resolution to read text too small for the screenshot",
+          runs_on="screen", params={
+              "x": "Left edge of the region in screenshot coordinates",
+              "y": "Top edge of the region in screenshot coordinates",
+              "width": "Region width in screenshot coordinates",
+              "height": "Region height in screenshot coordinates",
+          })
+    def read_screen_region(self, x: float, y: float, width: float, height: float) -> Dict[str, Any]:
+        """OCR part of the screen at native resolution.
+
+        The region is given in screenshot coordinates, captured straight from
+        the monitor at full resolution and OCR'd without downscaling, so small
+        text that is unreadable in the screenshot can still be resolved. Word
+        positions are reported back in screenshot coordinates, ready for
+        ``click_position`` or ``find_and_click``.
+
+        Args:
+            x: Left edge of the region in screenshot space.
+            y: Top edge of the region in screenshot space.
+            width: Region width in screenshot space.
+            height: Region height in screenshot space.
+
+        Returns:
+            Dict with 'success', 'text' (one '"word" at (x, y)' line per word), and 'message'.
+        """
+        try:
+            if self.coord_map is None:
+                return {"success": False, "error": "No screenshot has been taken yet"}
+            region = self.coord_map.region(int(x), int(y), int(width), int(height))
+            if region[2] == 0 or region[3] == 0:
+                return {"success": False, "error": "Region is outside the screenshot"}
+            
+            crop = capture.grab_screen(region=region)
+            words = ocr.run_ocr(cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY), offset=region[:2])
+            
+            # Physical pixels -> screenshot coordinates
+            for word in words:
+                left, top = self.coord_map.from_physical(word["left"], word["top"])
+                right, bottom = self.coord_map.from_physical(word["left"] + word["width"], word["top"] + word["height"])
+                word["left"], word["top"] = round(left), round(top)
+                word["width"], word["height"] = max(1, round(right - left)), max(1, round(bottom - top))
+            
+            self.region_index = OcrIndex(words)
+            return {
+                "success": True,
+                "text": self.region_index.text,
+                "message": f"Read {len(self.region_index)} words from region {region[2]}x{region[3]} at native resolution"
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+
+# Function-calling definitions of the built-in tools; plugins add to ``registry`` at startup
+TOOL_DEFINITIONS = registry.definitions()
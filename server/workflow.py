@@ -0,0 +1,271 @@
+"""
+Workflow engine for saved multi-step workflows.
+
+Workflows used to replay their steps one by one with the same pause after
+each, and a failure meant starting the whole workflow over. Now each step
+can say what to wait for once it has run::
+
+    {"tool": "launch_app", "args": {"app_name": "outlook"}, "wait": {"text": "Inbox", "timeout": 20}}
+
+Supported ``wait`` forms:
+    {"text": "Inbox"}     poll OCR until the text is on screen (timeout 10 s by default)
+    {"settle": true}      until the screen stops changing (the default for UI steps)
+    {"seconds": 2}        a fixed pause
+    {"settle": false}     no wait at all
+
+Consecutive steps that send no keyboard or mouse input (``CONCURRENT_TOOLS``,
+or any step marked ``"independent": true``) run concurrently; steps that save
+to memory always run on their own. Before a step that clicks by
+OCR position, the screen is re-read if an earlier UI step may have changed
+it, so later steps do not click against the screenshot taken when the
+command arrived.
+
+When a step or its wait fails, the run's position is checkpointed to
+``~/.remoto/data/workflow_checkpoints.json``. ``execute_workflow`` with
+``resume`` then starts again at the failing step. The step is re-run,
+including its wait; if it belonged to a group of concurrent steps, the
+whole group is re-run, including members that had succeeded. A checkpoint
+only applies while the workflow's steps are unchanged, and a successful run
+clears it.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from server.ocr_index import OcrIndex
+
+# Tools that send no keyboard or mouse input, so they need no settle wait afterwards
+NO_INPUT_TOOLS = {"list_workflows", "read_screen_region", "create_workflow", "save_learned_shortcut"}
+
+# Tools that save to Backboard memory; never run concurrently so saves happen in step order
+SAVING_TOOLS = {"create_workflow", "save_learned_shortcut"}
+
+# No-input tools that may run alongside each other
+CONCURRENT_TOOLS = NO_INPUT_TOOLS - SAVING_TOOLS
+
+# Tools that locate their target in the OCR index of the current screen
+OCR_TOOLS = {"find_and_click", "click_position"}
+
+DEFAULT_TEXT_TIMEOUT = 10.0
+TEXT_POLL_INTERVAL = 0.5
+
+DEFAULT_CHECKPOINT_PATH = Path.home() / ".remoto" / "data" / "workflow_checkpoints.json"
+
+ScreenReader = Callable[[], Awaitable[Tuple[Any, OcrIndex, Any]]]
+
+
+def steps_digest(steps: List[Dict[str, Any]]) -> str:
+    """Short hash of a workflow's steps, so a checkpoint is dropped when they change."""
+    return hashlib.blake2b(json.dumps(steps, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+
+def sends_input(step: Dict[str, Any]) -> bool:
+    """True if the step may send keyboard or mouse input (and so change the screen)."""
+    return not step.get("independent") and step.get("tool") not in NO_INPUT_TOOLS
+
+
+def is_independent(step: Dict[str, Any]) -> bool:
+    """True if the step may run concurrently with neighbouring independent steps."""
+    if step.get("tool") in SAVING_TOOLS:
+        return False
+    return bool(step.get("independent")) or step.get("tool") in CONCURRENT_TOOLS
+
+
+class CheckpointStore:
+    """Failed-run positions per workflow, persisted as JSON.
+
+    Args:
+        path: JSON file holding the checkpoints.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else DEFAULT_CHECKPOINT_PATH
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2)
+        except OSError as e:
+            print(f"[WARNING] Could not save workflow checkpoints: {e}")
+
+    def get(self, name: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint for ``name`` if it was taken against the same steps."""
+        entry = self._load().get(name)
+        return entry if entry is not None and entry.get("digest") == digest else None
+
+    def save(self, name: str, digest: str, step: int, error: str):
+        self._load()[name] = {"digest": digest, "step": step, "error": error, "failed_at": time.time()}
+        self._save()
+
+    def clear(self, name: str):
+        if self._load().pop(name, None) is not None:
+            self._save()
+
+
+class WorkflowRunner:
+    """Runs one workflow's steps with wait conditions, concurrency and checkpoints.
+
+    Args:
+        executor: ToolExecutor used to run each step, settle the screen and
+            refresh its OCR context.
+        checkpoints: Store for the positions of failed runs.
+    """
+
+    def __init__(self, executor, checkpoints: CheckpointStore):
+        self.executor = executor
+        self.checkpoints = checkpoints
+        self.screen_stale = False
+
+    async def _read_screen(self) -> Optional[OcrIndex]:
+        """Capture and OCR the screen, and make it the executor's current OCR context."""
+        reader: Optional[ScreenReader] = self.executor.screen_reader
+        if reader is None:
+            return None
+        frame, ocr_index, coord_map = await reader()
+        self.executor.set_ocr_context(ocr_index, coord_map)
+        self.executor.set_vision_context(frame, self.executor.thread_id)
+        self.screen_stale = False
+        return ocr_index
+
+    async def _wait(self, step: Dict[str, Any], label: str) -> Optional[str]:
+        """Apply a step's wait condition; return an error message if it was not met."""
+        wait = step.get("wait")
+        if wait is None:
+            wait = {"settle": True} if sends_input(step) else {}
+        if not isinstance(wait, dict):
+            return f"invalid wait {wait!r} (expected an object)"
+        try:
+            timeout = float(wait["timeout"]) if wait.get("timeout") is not None else None
+            seconds = float(wait["seconds"]) if "seconds" in wait else None
+        except (TypeError, ValueError):
+            return f"invalid wait {wait!r} (timeout and seconds must be numbers)"
+
+        if "text" in wait:
+            text = str(wait["text"])
+            deadline = time.monotonic() + (timeout if timeout is not None else DEFAULT_TEXT_TIMEOUT)
+            if self.executor.screen_reader is None:
+                return f"cannot wait for '{text}': screen capture unavailable"
+            while True:
+                ocr_index = await self._read_screen()
+                if ocr_index.find(text) is not None:
+                    return None
+                if time.monotonic() >= deadline:
+                    return f"timed out waiting for '{text}' to appear"
+                await asyncio.sleep(TEXT_POLL_INTERVAL)
+        if seconds is not None:
+            await asyncio.sleep(seconds)
+        elif wait.get("settle"):
+            await self.executor.settler.wait_async(timeout=timeout, label=label)
+        return None
+
+    async def _run_step(self, step: Any) -> Dict[str, Any]:
+        if not isinstance(step, dict) or not step.get("tool"):
+            return {"success": False, "error": f"invalid step {step!r} (expected an object with 'tool')"}
+        if step["tool"] in OCR_TOOLS and self.screen_stale:
+            await self._read_screen()
+        result = await self.executor.execute(step["tool"], step.get("args") or {})
+        if sends_input(step):
+            self.screen_stale = True
+        return result
+
+    async def run(self, name: str, steps: List[Dict[str, Any]], resume: bool = False) -> Dict[str, Any]:
+        """Run ``steps`` from the start, or from the failed step when resuming.
+
+        Returns:
+            Dict with 'success', 'workflow', 'steps_completed' and 'message'
+            on success. On failure it has 'error', 'completed_steps',
+            'failed_step' (1-based), 'resume_from' (1-based, the start of the
+            failed step's concurrent group) and 'resumable'.
+        """
+        digest = steps_digest(steps)
+        start = 0
+        if resume:
+            checkpoint = self.checkpoints.get(name, digest)
+            start = checkpoint["step"] if checkpoint else 0
+
+        index = start
+        while index < len(steps):
+            group = [index]
+            if isinstance(steps[index], dict) and is_independent(steps[index]):
+                while (group[-1] + 1 < len(steps) and isinstance(steps[group[-1] + 1], dict)
+                       and is_independent(steps[group[-1] + 1])):
+                    group.append(group[-1] + 1)
+
+            results = await asyncio.gather(*(self._run_step(steps[i]) for i in group))
+            failures = [(i, result.get("error")) for i, result in zip(group, results) if not result.get("success")]
+            if failures:
+                return self._failed(name, digest, steps, group, failures)
+
+            for i in group:
+                try:
+                    error = await self._wait(steps[i], f"{name} step {i + 1}")
+                except Exception as e:
+                    error = str(e)
+                if error:
+                    return self._failed(name, digest, steps, group, [(i, error)])
+            index = group[-1] + 1
+
+        self.checkpoints.clear(name)
+        resumed = f" (resumed at step {start + 1})" if start else ""
+        return {
+            "success": True,
+            "workflow": name,
+            "steps_completed": len(steps),
+            "resumed_from": start + 1 if start else None,
+            "message": f"Executed workflow '{name}' with {len(steps)} steps{resumed}"
+        }
+
+    def _failed(self, name: str, digest: str, steps: List[Dict[str, Any]], group: List[int],
+                failures: List[Tuple[int, Optional[str]]]) -> Dict[str, Any]:
+        """Checkpoint at the start of the failed group and build the failure result.
+
+        Args:
+            group: Indices of the steps that ran together (a single step when sequential).
+            failures: (index, error) for each failed step of the group, in step order.
+        """
+        def describe(index: int, error: Optional[str]) -> str:
+            step = steps[index]
+            tool = step.get("tool") if isinstance(step, dict) else None
+            return f"Step {index + 1} ({tool}) failed: {error}"
+
+        resume_at = group[0]
+        error = "; ".join(describe(index, error) for index, error in failures)
+        self.checkpoints.save(name, digest, resume_at, error)
+        print(f"[Workflow] '{name}' stopped ({len(steps)} steps): {error}")
+        if len(group) > 1:
+            message = (f"Steps {group[0] + 1}-{group[-1] + 1} ran concurrently; execute_workflow with "
+                       f"resume=true re-runs all of them from step {resume_at + 1}")
+        else:
+            message = f"Run execute_workflow with resume=true to continue from step {resume_at + 1}"
+        return {
+            "success": False,
+            "workflow": name,
+            "error": error,
+            "completed_steps": resume_at,
+            "failed_step": failures[0][0] + 1,
+            "resume_from": resume_at + 1,
+            "resumable": True,
+            "message": message
+        }
+
+
+def checkpoints_from_env() -> CheckpointStore:
+    """Checkpoint store at REMOTO_WORKFLOW_CHECKPOINTS (default ~/.remoto/data/workflow_checkpoints.json)."""
+    path = os.getenv("REMOTO_WORKFLOW_CHECKPOINTS")
+    return CheckpointStore(Path(path).expanduser() if path else None)
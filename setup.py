@@ -25,7 +25,9 @@ setup(
         "requests>=2.31",
         "fastapi>=0.100",
         "uvicorn>=0.20",
+        "websockets>=12.0",
         "pyautogui>=0.9",
+        "pyperclip>=1.8",
         "opencv-python>=4.8",
         "pytesseract>=0.3",
         "backboard-sdk>=1.4.0",